@@ -1,7 +1,7 @@
 """
 AI Experimentation Platform (co-i)
 
-A unified platform for managing AI model experimentation and deployment 
+A unified platform for managing AI model experimentation and deployment
 across multiple providers.
 """
 
@@ -13,4 +13,4 @@ __email__ = "michael@example.com"
 __title__ = "co-i"
 __description__ = "AI Experimentation Platform"
 __url__ = "https://github.com/rozenborg/co-i"
-__license__ = "MIT" 
\ No newline at end of file
+__license__ = "MIT"
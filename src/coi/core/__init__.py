@@ -3,4 +3,4 @@ Core functionality for the AI experimentation platform.
 
 This package contains core classes and utilities for managing experiments,
 responses, and platform configuration.
-""" 
\ No newline at end of file
+"""
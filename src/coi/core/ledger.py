@@ -0,0 +1,117 @@
+"""
+Response ledger for aggregating AI usage across experiments.
+
+This module provides a column-oriented store for token and cost accounting,
+so large experiment sweeps can be summarized without keeping every
+AIResponse object alive.
+"""
+
+from array import array
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..providers.base import AIResponse
+
+
+class ResponseLedger:
+    """
+    Column-oriented record of response usage and cost.
+
+    Token counts and costs are kept in typed arrays rather than one object
+    per response, so totals scan contiguous memory and can be exposed to
+    numpy without copying.
+    """
+
+    def __init__(self):
+        """Initialize an empty ledger."""
+        self.models: List[str] = []
+        self.providers: List[str] = []
+        self.prompt_tokens = array("q")
+        self.completion_tokens = array("q")
+        self.cache_read_tokens = array("q")
+        self.cache_write_tokens = array("q")
+        self.costs = array("d")
+
+    def append(self, response: AIResponse) -> None:
+        """
+        Record a single response.
+
+        Args:
+            response: Response to record
+        """
+        metadata = response.metadata or {}
+
+        columns = (
+            (self.prompt_tokens, response.prompt_tokens),
+            (self.completion_tokens, response.completion_tokens),
+            (self.cache_read_tokens, metadata.get("cache_read_input_tokens", 0)),
+            (self.cache_write_tokens, metadata.get("cache_creation_input_tokens", 0)),
+            (self.costs, response.cost_usd),
+        )
+
+        # Any column may still be exported through a numpy view, so undo the
+        # columns already grown before re-raising to keep them aligned
+        for i, (column, value) in enumerate(columns):
+            try:
+                column.append(value)
+            except BufferError:
+                for done, _ in columns[:i]:
+                    done.pop()
+                raise
+
+        self.models.append(response.model)
+        self.providers.append(response.provider)
+
+    def extend(self, responses: Iterable[AIResponse]) -> None:
+        """
+        Record several responses.
+
+        Args:
+            responses: Responses to record
+        """
+        for response in responses:
+            self.append(response)
+
+    @property
+    def total_cost(self) -> float:
+        """Total cost in USD across all recorded responses."""
+        return sum(self.costs)
+
+    @property
+    def total_tokens(self) -> int:
+        """Total prompt and completion tokens across all recorded responses."""
+        return sum(self.prompt_tokens) + sum(self.completion_tokens)
+
+    def to_numpy(self) -> Dict[str, "np.ndarray"]:
+        """
+        Expose the numeric columns as numpy arrays.
+
+        The arrays are views over the ledger's buffers, so no data is copied.
+        While any returned array is alive the buffers cannot be resized, so
+        the ledger is read-only: append() and extend() raise BufferError.
+        Delete the arrays (or copy them) before recording more responses.
+
+        Returns:
+            Dictionary mapping column names to arrays
+        """
+        if np is None:
+            raise ImportError(
+                "numpy package not found. Install with: pip install numpy"
+            )
+
+        return {
+            "prompt_tokens": np.frombuffer(self.prompt_tokens, dtype=np.int64),
+            "completion_tokens": np.frombuffer(self.completion_tokens, dtype=np.int64),
+            "cache_read_tokens": np.frombuffer(self.cache_read_tokens, dtype=np.int64),
+            "cache_write_tokens": np.frombuffer(
+                self.cache_write_tokens, dtype=np.int64
+            ),
+            "costs": np.frombuffer(self.costs, dtype=np.float64),
+        }
+
+    def __len__(self) -> int:
+        return len(self.costs)
@@ -5,9 +5,15 @@ This package contains provider classes for different AI services like
 OpenAI, Anthropic, Azure OpenAI, and custom providers.
 """
 
-from .base import BaseProvider
-from .openai_provider import OpenAIProvider
 from .anthropic_provider import AnthropicProvider
+from .base import BaseProvider, GenerateOptions
 from .factory import ProviderFactory
+from .openai_provider import OpenAIProvider
 
-__all__ = ["BaseProvider", "OpenAIProvider", "AnthropicProvider", "ProviderFactory"] 
\ No newline at end of file
+__all__ = [
+    "BaseProvider",
+    "GenerateOptions",
+    "OpenAIProvider",
+    "AnthropicProvider",
+    "ProviderFactory",
+]
@@ -1,234 +1,246 @@
 """
 Anthropic provider implementation for the AI experimentation platform.
 
-This module provides integration with Anthropic's Claude API including Claude-3 
+This module provides integration with Anthropic's Claude API including Claude-3
 models with proper error handling and cost calculation.
 """
 
-import asyncio
-from typing import List, Optional, Dict, Any
 import logging
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
 
 try:
-    from anthropic import AsyncAnthropic
-    from anthropic.types import Message
+    import anthropic
+    from anthropic import APIError, AsyncAnthropic, AuthenticationError
     from anthropic import RateLimitError as AnthropicRateLimitError
-    from anthropic import AuthenticationError, APIError
+    from anthropic.types import Message
 except ImportError:
-    raise ImportError("Anthropic package not found. Install with: pip install anthropic")
-
-from .base import (
-    BaseProvider, 
-    AIResponse, 
-    ProviderConfig, 
-    ProviderError, 
-    RateLimitError, 
-    InvalidConfigError,
-    ModelNotFoundError
-)
+    raise ImportError(
+        "Anthropic package not found. Install with: pip install anthropic"
+    )
+
+from .base import ParsedResponse, _ChatProvider
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of a stable prompt prefix for Anthropic prompt caching
+CACHE_CONTROL = {"type": "ephemeral"}
 
-class AnthropicProvider(BaseProvider):
+
+class AnthropicProvider(_ChatProvider):
     """
     Anthropic provider implementation.
-    
-    Supports Claude-3 models with comprehensive error handling, 
+
+    Supports Claude-3 models with comprehensive error handling,
     cost calculation, and retry logic.
     """
-    
-    # Current pricing per 1K tokens (as of July 2024)
+
+    VENDOR_NAME = "Anthropic"
+    DEFAULT_MODEL = "claude-3-5-sonnet-20241022"
+
+    _KEY_RE = re.compile(r"sk-ant-[A-Za-z0-9_\-]+")
+
+    _sdk = anthropic
+    _rate_limit_exc = AnthropicRateLimitError
+    _auth_exc = AuthenticationError
+    _api_exc = APIError
+
+    # Current pricing per 1K tokens (as of July 2024); cache reads bill at
+    # 10% and cache writes at 125% of the base input rate
     PRICING = {
-        'claude-3-5-sonnet-20241022': {'input': 0.003, 'output': 0.015},
-        'claude-3-5-sonnet-20240620': {'input': 0.003, 'output': 0.015},
-        'claude-3-opus-20240229': {'input': 0.015, 'output': 0.075},
-        'claude-3-sonnet-20240229': {'input': 0.003, 'output': 0.015},
-        'claude-3-haiku-20240307': {'input': 0.00025, 'output': 0.00125},
+        "claude-3-5-sonnet-20241022": {
+            "input": 0.003,
+            "output": 0.015,
+            "cache_read": 0.0003,
+            "cache_write": 0.00375,
+        },
+        "claude-3-5-sonnet-20240620": {
+            "input": 0.003,
+            "output": 0.015,
+            "cache_read": 0.0003,
+            "cache_write": 0.00375,
+        },
+        "claude-3-opus-20240229": {
+            "input": 0.015,
+            "output": 0.075,
+            "cache_read": 0.0015,
+            "cache_write": 0.01875,
+        },
+        "claude-3-sonnet-20240229": {
+            "input": 0.003,
+            "output": 0.015,
+            "cache_read": 0.0003,
+            "cache_write": 0.00375,
+        },
+        "claude-3-haiku-20240307": {
+            "input": 0.00025,
+            "output": 0.00125,
+            "cache_read": 0.000025,
+            "cache_write": 0.0003125,
+        },
     }
-    
-    def __init__(self, config: ProviderConfig):
-        """Initialize Anthropic provider."""
-        super().__init__(config)
-        
-        # Initialize Anthropic client
-        client_kwargs = {
-            'api_key': config.api_key,
-            'timeout': config.timeout,
-            'max_retries': config.max_retries,
-        }
-        
-        if config.base_url:
-            client_kwargs['base_url'] = config.base_url
-            
-        self.client = AsyncAnthropic(**client_kwargs)
-        
-        self.logger.info(f"Anthropic provider initialized with timeout={config.timeout}s")
-    
-    def _validate_config(self) -> None:
-        """Validate Anthropic configuration."""
-        if not self.config.api_key:
-            raise InvalidConfigError("Anthropic API key is required", "anthropic")
-        
-        if not self.config.api_key.startswith('sk-ant-'):
-            raise InvalidConfigError("Anthropic API key must start with 'sk-ant-'", "anthropic")
-        
-        if self.config.timeout <= 0:
-            raise InvalidConfigError("Timeout must be positive", "anthropic")
-    
-    async def generate(
+
+    def _create_client(self, client_kwargs: Dict[str, Any]) -> AsyncAnthropic:
+        """Create the Anthropic SDK client."""
+        return AsyncAnthropic(**client_kwargs)
+
+    def _build_request(
         self,
         prompt: str,
-        model: str = 'claude-3-5-sonnet-20241022',
-        temperature: float = 0.7,
-        max_tokens: Optional[int] = None,
-        **kwargs
-    ) -> AIResponse:
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        system: Optional[str] = None,
+        history: Optional[List[Dict[str, Any]]] = None,
+        context: Optional[str] = None,
+        top_p: Optional[float] = None,
+        stop: Optional[Sequence[str]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
         """
-        Generate response using Anthropic's API.
-        
-        Args:
-            prompt: Input prompt for the model
-            model: Anthropic model to use
-            temperature: Sampling temperature (0.0 to 1.0)
-            max_tokens: Maximum tokens to generate
-            **kwargs: Additional Anthropic parameters
-            
-        Returns:
-            AIResponse with generated content and metadata
-            
-        Raises:
-            ProviderError: If API call fails
-            RateLimitError: If rate limits are exceeded
-            ModelNotFoundError: If model is not available
+        Build message parameters with the stable prefix marked cacheable.
+
+        The system prompt and prior turns form a stable prefix and are marked
+        with cache_control so Anthropic can reuse it across calls. Optional
+        context is sent as a cacheable block before the prompt.
+
+        The Messages API in anthropic SDK 1.x has no sampling parameters, so
+        temperature and top_p are not sent. Temperature still decides
+        whether the response may be cached.
         """
-        self.logger.debug(f"Generating with model={model}, temperature={temperature}")
-        
-        try:
-            # Prepare request parameters
-            request_params = {
-                'model': model,
-                'messages': [{'role': 'user', 'content': prompt}],
-                'temperature': temperature,
-                'max_tokens': max_tokens or 1000,  # Anthropic requires max_tokens
-                **kwargs
-            }
-            
-            # Make API call with retry logic
-            response = await self._make_api_call(request_params)
-            
-            # Extract response data
-            content = response.content[0].text
-            usage = response.usage
-            
-            # Calculate cost
-            cost = self._calculate_cost(
-                model=model,
-                prompt_tokens=usage.input_tokens,
-                completion_tokens=usage.output_tokens
+        request_params = {
+            "model": model,
+            "messages": self._build_messages(prompt, history, context),
+            "max_tokens": max_tokens or 1000,  # Anthropic requires max_tokens
+            **kwargs,
+        }
+
+        if system:
+            request_params["system"] = [
+                {"type": "text", "text": system, "cache_control": CACHE_CONTROL}
+            ]
+        if top_p is not None:
+            self.logger.debug(
+                "Ignoring top_p=%s; not supported by the Anthropic Messages API", top_p
             )
-            
-            # Create standardized response
-            ai_response = AIResponse(
-                content=content,
-                prompt_tokens=usage.input_tokens,
-                completion_tokens=usage.output_tokens,
-                total_tokens=usage.input_tokens + usage.output_tokens,
-                model=model,
-                cost_usd=cost,
-                provider="anthropic",
-                metadata={
-                    'stop_reason': response.stop_reason,
-                    'response_id': response.id,
-                    'model': response.model,
-                    'role': response.role,
-                    'temperature': temperature,
-                    'max_tokens': max_tokens,
+        if stop:
+            request_params["stop_sequences"] = list(stop)
+
+        return request_params
+
+    def _parse(self, response: Message) -> ParsedResponse:
+        """Extract content and usage, including prompt cache reads and writes."""
+        usage = response.usage
+        cache_read_tokens = getattr(usage, "cache_read_input_tokens", None) or 0
+        cache_write_tokens = getattr(usage, "cache_creation_input_tokens", None) or 0
+        metadata = {
+            "stop_reason": response.stop_reason,
+            "response_id": response.id,
+            "model": response.model,
+            "role": response.role,
+            "cache_read_input_tokens": cache_read_tokens,
+            "cache_creation_input_tokens": cache_write_tokens,
+        }
+        return (
+            response.content[0].text,
+            usage.input_tokens,
+            usage.output_tokens,
+            cache_read_tokens,
+            cache_write_tokens,
+            metadata,
+        )
+
+    async def _stream_text(
+        self, params: Dict[str, Any], final: List[ParsedResponse]
+    ) -> AsyncIterator[str]:
+        """Stream text from the messages endpoint, then parse the final message."""
+        async with self.client.messages.stream(**params) as stream:
+            async for text in stream.text_stream:
+                yield text
+            final.append(self._parse(await stream.get_final_message()))
+
+    async def _submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """Create a Message Batch with one entry per request."""
+        batch = await self.client.messages.batches.create(
+            requests=[
+                {"custom_id": str(i), "params": params}
+                for i, params in enumerate(requests)
+            ]
+        )
+        return batch.id
+
+    async def _batch_ended(self, batch_id: str) -> bool:
+        """Check whether a Message Batch has finished processing."""
+        batch = await self.client.messages.batches.retrieve(batch_id)
+        return batch.processing_status == "ended"
+
+    async def _batch_results(
+        self, batch_id: str
+    ) -> Dict[str, Union[ParsedResponse, str]]:
+        """Read Message Batch results, parsing succeeded messages."""
+        results: Dict[str, Union[ParsedResponse, str]] = {}
+
+        async for entry in await self.client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = self._parse(entry.result.message)
+            else:
+                error = getattr(entry.result, "error", None)
+                results[entry.custom_id] = (
+                    f"{entry.result.type}: {error}" if error else entry.result.type
+                )
+
+        return results
+
+    def _build_messages(
+        self,
+        prompt: str,
+        history: Optional[List[Dict[str, Any]]],
+        context: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Build the message list, marking the end of the stable prefix as cacheable."""
+        messages = [dict(message) for message in history or []]
+
+        if messages and isinstance(messages[-1]["content"], str):
+            messages[-1]["content"] = [
+                {
+                    "type": "text",
+                    "text": messages[-1]["content"],
+                    "cache_control": CACHE_CONTROL,
+                }
+            ]
+
+        if context:
+            messages.append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": context,
+                            "cache_control": CACHE_CONTROL,
+                        },
+                        {"type": "text", "text": prompt},
+                    ],
                 }
             )
-            
-            self.logger.info(
-                f"Generated response: {usage.input_tokens + usage.output_tokens} tokens, "
-                f"${cost:.6f} cost, stop_reason={response.stop_reason}"
-            )
-            
-            return ai_response
-            
-        except AnthropicRateLimitError as e:
-            self.logger.warning(f"Rate limit exceeded: {e}")
-            raise RateLimitError(str(e), "anthropic", model)
-            
-        except AuthenticationError as e:
-            self.logger.error(f"Authentication failed: {e}")
-            raise InvalidConfigError(f"Invalid API key: {e}", "anthropic")
-            
-        except APIError as e:
-            if "model" in str(e).lower() and "not found" in str(e).lower():
-                raise ModelNotFoundError(f"Model {model} not found: {e}", "anthropic", model)
-            self.logger.error(f"Anthropic API error: {e}")
-            raise ProviderError(f"API error: {e}", "anthropic", model)
-            
-        except Exception as e:
-            self.logger.error(f"Unexpected error: {e}")
-            raise ProviderError(f"Unexpected error: {e}", "anthropic", model)
-    
-    async def _make_api_call(self, params: Dict[str, Any]) -> Message:
-        """Make API call with exponential backoff retry."""
-        for attempt in range(self.config.max_retries + 1):
-            try:
-                return await self.client.messages.create(**params)
-            except AnthropicRateLimitError:
-                if attempt == self.config.max_retries:
-                    raise
-                wait_time = 2 ** attempt
-                self.logger.warning(f"Rate limited, retrying in {wait_time}s (attempt {attempt + 1})")
-                await asyncio.sleep(wait_time)
-            except Exception:
-                if attempt == self.config.max_retries:
-                    raise
-                wait_time = min(2 ** attempt, 60)
-                self.logger.warning(f"API call failed, retrying in {wait_time}s (attempt {attempt + 1})")
-                await asyncio.sleep(wait_time)
-    
-    def _calculate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
-        """Calculate cost based on token usage and model pricing."""
-        if model not in self.PRICING:
-            self.logger.warning(f"Unknown model '{model}', using claude-3-5-sonnet pricing")
-            model = 'claude-3-5-sonnet-20241022'
-        
-        pricing = self.PRICING[model]
-        input_cost = (prompt_tokens / 1000) * pricing['input']
-        output_cost = (completion_tokens / 1000) * pricing['output']
-        
-        return input_cost + output_cost
-    
-    def get_available_models(self) -> List[str]:
-        """Get list of supported Anthropic models."""
-        return list(self.PRICING.keys())
-    
-    def estimate_cost(
-        self, 
-        prompt: str, 
-        model: str, 
-        max_tokens: Optional[int] = None
-    ) -> float:
+        else:
+            messages.append({"role": "user", "content": prompt})
+
+        return messages
+
+    async def count_tokens(self, prompt: str, model: Optional[str] = None) -> int:
         """
-        Estimate cost for a generation request.
-        
+        Count prompt tokens exactly using Anthropic's token counting endpoint.
+
         Args:
             prompt: Input prompt
             model: Anthropic model name
-            max_tokens: Maximum tokens to generate
-            
+
         Returns:
-            Estimated cost in USD
+            Number of input tokens the prompt will use
         """
-        # Rough estimation: ~4 characters per token
-        estimated_prompt_tokens = len(prompt) // 4
-        estimated_completion_tokens = max_tokens or 100
-        
-        return self._calculate_cost(
-            model=model,
-            prompt_tokens=estimated_prompt_tokens,
-            completion_tokens=estimated_completion_tokens
-        )
\ No newline at end of file
+        result = await self.client.messages.count_tokens(
+            model=model or self.DEFAULT_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return result.input_tokens
@@ -5,22 +5,79 @@ This module defines the abstract base class that all AI providers must implement
 to ensure consistent behavior across different AI services.
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import asyncio
 import logging
+import random
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+from functools import partial
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ..utils.config import DATACLASS_SLOTS
+from .cache import create_cache, make_cache_key
+
+if TYPE_CHECKING:
+    from .semantic_cache import SemanticCache
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing shared by all provider HTTP clients, as arguments
+# for the Limits class of whichever HTTP package the vendor SDK is built on
+HTTP_POOL_LIMITS: Dict[str, int] = {
+    "max_keepalive_connections": 32,
+    "max_connections": 64,
+}
+
+# Backoff bounds in seconds for retried API calls
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+# Price multiplier for requests sent through vendor batch APIs
+BATCH_DISCOUNT = 0.5
+
+# Bounds in seconds between batch status checks
+BATCH_POLL_INITIAL = 5.0
+BATCH_POLL_MAX = 300.0
+
+# HTTP statuses that will fail the same way on every attempt
+NON_RETRYABLE_STATUS = frozenset({400, 401, 403, 404, 422})
 
-@dataclass
+# Content and usage extracted from a vendor response: (content, uncached
+# prompt tokens, completion tokens, cache read tokens, cache write tokens,
+# vendor metadata)
+ParsedResponse = Tuple[str, int, int, int, int, Dict[str, Any]]
+
+
+@dataclass(**DATACLASS_SLOTS)
 class AIResponse:
     """
     Standard response container for AI provider outputs.
-    
+
     This class provides a consistent interface for AI responses regardless
     of the underlying provider implementation.
     """
+
     content: str
     prompt_tokens: int
     completion_tokens: int
@@ -31,103 +88,556 @@ class AIResponse:
     metadata: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ProviderConfig:
     """Configuration container for AI providers."""
+
     api_key: str
     base_url: Optional[str] = None
     organization: Optional[str] = None
     timeout: int = 30
     max_retries: int = 3
     extra_headers: Optional[Dict[str, str]] = None
+    cache_backend: Optional[str] = "memory"
+    cache_ttl: int = 3600
+    cache_dir: Optional[str] = None
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class GenerateOptions:
+    """
+    Vendor-neutral generation options.
+
+    Each provider maps these onto its own request fields (for example
+    ``stop`` becomes Anthropic's ``stop_sequences``), so one options object
+    behaves the same across vendors.
+    """
+
+    temperature: float = 0.7
+    max_tokens: Optional[int] = None
+    top_p: Optional[float] = None
+    stop: Optional[Sequence[str]] = None
+    system: Optional[str] = None
+
+    def request_kwargs(self) -> Dict[str, Any]:
+        """Return the optional request fields that are set."""
+        fields = {"top_p": self.top_p, "stop": self.stop, "system": self.system}
+        return {name: value for name, value in fields.items() if value is not None}
 
 
 class BaseProvider(ABC):
     """
     Abstract base class for all AI providers.
-    
+
     This class defines the interface that all AI providers must implement
     to work with the experimentation platform.
     """
-    
+
+    # Model used when generate() is called without one
+    DEFAULT_MODEL: str = ""
+
+    # Pricing per 1K tokens keyed by model, defined by each provider
+    PRICING: Dict[str, Dict[str, float]] = {}
+
+    # Per-token (input, output, cache_read, cache_write) rates derived from
+    # PRICING when the provider class is defined
+    _PER_TOKEN: Dict[str, Tuple[float, float, float, float]] = {}
+
+    # Vendor SDK client, created by each provider in __init__
+    client: Any
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._PER_TOKEN = {
+            model: (
+                p["input"] / 1000.0,
+                p["output"] / 1000.0,
+                p.get("cache_read", p["input"]) / 1000.0,
+                p.get("cache_write", p["input"]) / 1000.0,
+            )
+            for model, p in cls.PRICING.items()
+        }
+
     def __init__(self, config: ProviderConfig):
         """
         Initialize the provider with configuration.
-        
+
         Args:
             config: Provider configuration containing API keys and settings
         """
         self.config = config
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self._validate_config()
-    
+        self._cache = create_cache(
+            config.cache_backend, ttl=config.cache_ttl, directory=config.cache_dir
+        )
+
+        # Upper bound of the jittered wait before each retry attempt
+        self._backoff_caps = [
+            min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt)
+            for attempt in range(config.max_retries + 1)
+        ]
+
+        # Optional similarity cache consulted after an exact-match miss
+        self.semantic_cache: Optional["SemanticCache"] = None
+
+        # Deterministic requests currently awaiting the API, keyed by cache key
+        self._inflight: Dict[str, "asyncio.Future[AIResponse]"] = {}
+
     @abstractmethod
     def _validate_config(self) -> None:
         """
         Validate the provider configuration.
-        
+
         Raises:
             ValueError: If configuration is invalid
         """
         pass
-    
-    @abstractmethod
+
     async def generate(
-        self, 
-        prompt: str, 
-        model: str,
+        self,
+        prompt: str,
+        model: Optional[str] = None,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        **kwargs
+        options: Optional[GenerateOptions] = None,
+        **kwargs,
     ) -> AIResponse:
         """
         Generate a response using the AI provider.
-        
+
+        Deterministic calls (temperature 0) are served from the response cache
+        when an identical request has already been made, falling back to the
+        semantic cache (if attached) for similar prompts. Identical
+        deterministic calls made concurrently share a single API request.
+
         Args:
             prompt: The input prompt to send to the AI model
-            model: The specific model to use for generation
+            model: The specific model to use (defaults to DEFAULT_MODEL)
             temperature: Controls randomness (0.0 to 1.0)
             max_tokens: Maximum number of tokens to generate
+            options: Typed options; overrides temperature and max_tokens
             **kwargs: Additional provider-specific parameters
-            
+
         Returns:
             AIResponse: Standardized response object
-            
+
+        Raises:
+            ProviderError: If the API call fails
+        """
+        model = model or self.DEFAULT_MODEL
+        temperature, max_tokens, kwargs = self._apply_options(
+            options, temperature, max_tokens, kwargs
+        )
+
+        if temperature != 0:
+            return await self._generate_impl(
+                prompt, model, temperature, max_tokens, **kwargs
+            )
+
+        key = make_cache_key(
+            provider=self.get_provider_name(),
+            model=model,
+            prompt=prompt,
+            max_tokens=max_tokens,
+            options=kwargs,
+        )
+
+        cached = None
+        if self._cache is not None:
+            cached = self._cache.get(key)
+            self.logger.debug(
+                "Cache %s for model=%s, hit_rate=%.1f%%",
+                "hit" if cached is not None else "miss",
+                model,
+                self._cache.hit_rate * 100,
+            )
+
+        # Semantic matches must share every setting except the prompt text
+        semantic_key = vector = None
+        if cached is None and self.semantic_cache is not None:
+            semantic_key = make_cache_key(
+                provider=self.get_provider_name(),
+                model=model,
+                max_tokens=max_tokens,
+                options=kwargs,
+            )
+            vector = await self.semantic_cache.query_vector(prompt)
+            if vector is not None:
+                cached = await self.semantic_cache.get(
+                    prompt, semantic_key, vector=vector
+                )
+
+        # Hits cost nothing; token counts still describe the cached response
+        if cached is not None:
+            return replace(
+                cached,
+                cost_usd=0.0,
+                metadata={
+                    **(cached.metadata or {}),
+                    "cache_hit": True,
+                    "original_cost_usd": cached.cost_usd,
+                },
+            )
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._generate_and_cache(
+                    key,
+                    semantic_key,
+                    vector,
+                    prompt,
+                    model,
+                    temperature,
+                    max_tokens,
+                    **kwargs,
+                )
+            )
+            self._inflight[key] = inflight
+            inflight.add_done_callback(partial(self._inflight_done, key))
+        else:
+            self.logger.debug("Joining in-flight request for model=%s", model)
+
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(inflight)
+
+    def _inflight_done(self, key: str, task: "asyncio.Future[AIResponse]") -> None:
+        """Forget a finished in-flight request."""
+        # Every waiter may have been cancelled, so retrieve the exception here
+        # to keep asyncio from logging it as never retrieved
+        if not task.cancelled():
+            task.exception()
+        self._inflight.pop(key, None)
+
+    @staticmethod
+    def _apply_options(
+        options: Optional[GenerateOptions],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any],
+    ) -> Tuple[float, Optional[int], Dict[str, Any]]:
+        """Merge a GenerateOptions object into the loose call arguments."""
+        if options is None:
+            return temperature, max_tokens, kwargs
+        return (
+            options.temperature,
+            options.max_tokens,
+            {**options.request_kwargs(), **kwargs},
+        )
+
+    async def _generate_and_cache(
+        self,
+        key: str,
+        semantic_key: Optional[str],
+        vector: Any,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs,
+    ) -> AIResponse:
+        """
+        Generate a response and store it in the configured caches.
+
+        The semantic cache reuses the prompt embedding computed for the
+        lookup, so a miss costs a single embedding call.
+        """
+        response = await self._generate_impl(
+            prompt, model, temperature, max_tokens, **kwargs
+        )
+
+        if self._cache is not None:
+            self._cache.set(key, response)
+        if semantic_key is not None and vector is not None:
+            await self.semantic_cache.set(prompt, semantic_key, response, vector=vector)
+
+        return response
+
+    @abstractmethod
+    async def _generate_impl(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs,
+    ) -> AIResponse:
+        """
+        Call the provider API and build a standardized response.
+
+        Args:
+            prompt: The input prompt to send to the AI model
+            model: The specific model to use for generation
+            temperature: Controls randomness
+            max_tokens: Maximum number of tokens to generate
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            AIResponse: Standardized response object
+
         Raises:
             ProviderError: If the API call fails
         """
         pass
-    
+
+    async def stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        options: Optional[GenerateOptions] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response as text chunks.
+
+        Providers without native streaming yield the full response as a
+        single chunk.
+
+        Args:
+            prompt: The input prompt to send to the AI model
+            model: The specific model to use (defaults to DEFAULT_MODEL)
+            temperature: Controls randomness (0.0 to 1.0)
+            max_tokens: Maximum number of tokens to generate
+            options: Typed options; overrides temperature and max_tokens
+            **kwargs: Additional provider-specific parameters
+
+        Yields:
+            Text chunks as they are generated
+        """
+        response = await self.generate(
+            prompt, model, temperature, max_tokens, options, **kwargs
+        )
+        yield response.content
+
+    async def generate_many(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        max_concurrency: int = 5,
+        **kwargs,
+    ) -> List[AIResponse]:
+        """
+        Generate responses for several prompts concurrently.
+
+        Requests are dispatched together so their network round-trips overlap,
+        while a semaphore caps how many are in flight to respect rate limits.
+
+        Args:
+            prompts: Input prompts, one request per prompt
+            model: The specific model to use for generation
+            max_concurrency: Maximum number of requests in flight at once
+            **kwargs: Additional parameters passed to generate()
+
+        Returns:
+            List of AIResponse objects in the same order as prompts
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _generate_one(prompt: str) -> AIResponse:
+            async with semaphore:
+                return await self.generate(prompt, model, **kwargs)
+
+        return list(await asyncio.gather(*(_generate_one(p) for p in prompts)))
+
     @abstractmethod
     def get_available_models(self) -> List[str]:
         """
         Get list of available models for this provider.
-        
+
         Returns:
             List of model names supported by this provider
         """
         pass
-    
+
     @abstractmethod
     def estimate_cost(
-        self, 
-        prompt: str, 
-        model: str, 
-        max_tokens: Optional[int] = None
+        self, prompt: str, model: str, max_tokens: Optional[int] = None
     ) -> float:
         """
         Estimate the cost of a generation request.
-        
+
         Args:
             prompt: The input prompt
             model: The model to use
             max_tokens: Maximum tokens to generate
-            
+
         Returns:
             Estimated cost in USD
         """
         pass
-    
+
+    async def _call_with_retry(
+        self,
+        create: Callable[..., Awaitable[Any]],
+        params: Dict[str, Any],
+        rate_limit_error: Type[Exception],
+    ) -> Any:
+        """
+        Call an SDK method, retrying failures with jittered exponential backoff.
+
+        Each wait is drawn uniformly from [0, base * 2**attempt] ("full jitter")
+        so concurrent callers do not retry in lockstep. Rate limit errors wait
+        at least as long as the server's Retry-After header asks. Client
+        errors such as bad requests or invalid keys are raised immediately.
+
+        Args:
+            create: SDK coroutine function to call
+            params: Keyword arguments for the call
+            rate_limit_error: SDK exception type raised on rate limiting
+
+        Returns:
+            The SDK response
+        """
+        # Bind loop invariants once; this path runs hot during rate-limit storms
+        max_retries = self.config.max_retries
+        backoff_caps = self._backoff_caps
+        uniform = random.uniform
+        sleep = asyncio.sleep
+
+        for attempt in range(max_retries + 1):
+            try:
+                return await create(**params)
+            except Exception as e:
+                if (
+                    attempt == max_retries
+                    or getattr(e, "status_code", None) in NON_RETRYABLE_STATUS
+                ):
+                    raise
+
+                is_rate_limit = isinstance(e, rate_limit_error)
+                wait_time = uniform(0, backoff_caps[attempt])
+                if is_rate_limit:
+                    wait_time = max(wait_time, self._get_retry_after(e) or 0.0)
+
+                self.logger.warning(
+                    "%s, retrying: attempt=%d wait_ms=%.0f limit_type=%s",
+                    "Rate limited" if is_rate_limit else "API call failed",
+                    attempt + 1,
+                    wait_time * 1000,
+                    "rate_limit" if is_rate_limit else "error",
+                )
+                await sleep(wait_time)
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> Optional[float]:
+        """Read the server-requested retry delay in seconds from an SDK error."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None)
+        if not headers:
+            return None
+
+        try:
+            if headers.get("retry-after-ms"):
+                return min(float(headers["retry-after-ms"]) / 1000, RETRY_MAX_DELAY)
+            if headers.get("retry-after"):
+                return min(float(headers["retry-after"]), RETRY_MAX_DELAY)
+        except ValueError:
+            pass
+
+        return None
+
+    def _create_http_client(self, sdk: ModuleType) -> Any:
+        """
+        Create a pooled HTTP client for the provider SDK.
+
+        Keeping connections alive between calls avoids paying a new TCP and
+        TLS handshake on every request. The client is built from the SDK's
+        own HTTP stack, since SDKs reject clients from a different package.
+
+        Args:
+            sdk: Vendor SDK module exposing DefaultAsyncHttpxClient
+
+        Returns:
+            SDK HTTP client configured with the shared pool limits
+        """
+        limits = type(sdk.DEFAULT_CONNECTION_LIMITS)(**HTTP_POOL_LIMITS)
+        return sdk.DefaultAsyncHttpxClient(limits=limits, timeout=self.config.timeout)
+
+    async def aclose(self) -> None:
+        """Close the SDK client and release its pooled connections."""
+        await self.client.close()
+
+    async def __aenter__(self) -> "BaseProvider":
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.aclose()
+
+    @classmethod
+    def calculate_costs_bulk(
+        cls,
+        models: Sequence[str],
+        prompt_tokens: Sequence[int],
+        completion_tokens: Sequence[int],
+        cache_read_tokens: Optional[Sequence[int]] = None,
+        cache_write_tokens: Optional[Sequence[int]] = None,
+    ) -> "np.ndarray":
+        """
+        Calculate costs for many calls in one vectorized operation.
+
+        Intended for aggregating large experiment ledgers, where calling
+        _calculate_cost per response dominates the accounting time. Unknown
+        models are priced like DEFAULT_MODEL.
+
+        Args:
+            models: Model name for each call
+            prompt_tokens: Uncached input tokens for each call
+            completion_tokens: Output tokens for each call
+            cache_read_tokens: Input tokens read from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
+
+        Returns:
+            Array of costs in USD, one per call
+        """
+        if np is None:
+            raise ImportError(
+                "numpy package not found. Install with: pip install numpy"
+            )
+
+        table, index = cls._get_price_table()
+        default = index.get(cls.DEFAULT_MODEL, 0)
+        rows = np.fromiter(
+            (index.get(m, default) for m in models), dtype=np.int64, count=len(models)
+        )
+
+        zeros = np.zeros(len(rows))
+        tokens = np.stack(
+            [
+                np.asarray(prompt_tokens, dtype=np.float64),
+                np.asarray(completion_tokens, dtype=np.float64),
+                (
+                    zeros
+                    if cache_read_tokens is None
+                    else np.asarray(cache_read_tokens, dtype=np.float64)
+                ),
+                (
+                    zeros
+                    if cache_write_tokens is None
+                    else np.asarray(cache_write_tokens, dtype=np.float64)
+                ),
+            ],
+            axis=1,
+        )
+
+        return np.einsum("ij,ij->i", table[rows], tokens)
+
+    @classmethod
+    def _get_price_table(cls) -> Tuple["np.ndarray", Dict[str, int]]:
+        """Build (once per class) the per-token price matrix and model index."""
+        if "_price_table" not in cls.__dict__:
+            table = np.array(list(cls._PER_TOKEN.values()), dtype=np.float64).reshape(
+                -1, 4
+            )
+            cls._price_table = (
+                table,
+                {model: i for i, model in enumerate(cls._PER_TOKEN)},
+            )
+
+        return cls._price_table
+
     def get_provider_name(self) -> str:
         """Get the name of this provider."""
         return self.__class__.__name__.replace("Provider", "").lower()
@@ -135,7 +645,7 @@ class BaseProvider(ABC):
 
 class ProviderError(Exception):
     """Base exception for provider-related errors."""
-    
+
     def __init__(self, message: str, provider: str, model: Optional[str] = None):
         self.provider = provider
         self.model = model
@@ -144,14 +654,491 @@ class ProviderError(Exception):
 
 class RateLimitError(ProviderError):
     """Raised when provider rate limits are exceeded."""
+
     pass
 
 
 class InvalidConfigError(ProviderError):
     """Raised when provider configuration is invalid."""
+
     pass
 
 
 class ModelNotFoundError(ProviderError):
     """Raised when requested model is not available."""
-    pass 
\ No newline at end of file
+
+    pass
+
+
+class _ChatProvider(BaseProvider):
+    """
+    Shared implementation for chat-style vendor APIs.
+
+    Handles config validation, the retried API call, response assembly,
+    error mapping, cost calculation and streaming. Subclasses supply the
+    vendor pieces: the SDK client, request payload, streaming call and
+    SDK exception types.
+
+    generate() and stream() share one code path: both consume the vendor
+    stream, generate() simply accumulating it into a single response.
+    """
+
+    # Human-readable vendor name used in log and error messages
+    VENDOR_NAME: str = ""
+
+    # Accepted API key format, compiled once per provider class
+    _KEY_RE: Pattern[str] = re.compile(r".+")
+
+    # SDK exception types translated by _map_error, set by each provider
+    _rate_limit_exc: Type[Exception] = Exception
+    _auth_exc: Type[Exception] = Exception
+    _api_exc: Type[Exception] = Exception
+
+    # Vendor SDK module providing the HTTP client, set by each provider
+    _sdk: Optional[ModuleType] = None
+
+    def __init__(self, config: ProviderConfig):
+        """Initialize the provider and its SDK client."""
+        super().__init__(config)
+        self.client = self._create_client(self._client_kwargs())
+        self.logger.info(
+            "%s provider initialized with timeout=%ss", self.VENDOR_NAME, config.timeout
+        )
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        """Build keyword arguments for the SDK client."""
+        client_kwargs = {
+            "api_key": self.config.api_key,
+            "timeout": self.config.timeout,
+            # Retries are handled by _call_with_retry; SDK retries would multiply them
+            "max_retries": 0,
+            "http_client": self._create_http_client(self._sdk),
+        }
+
+        if self.config.base_url:
+            client_kwargs["base_url"] = self.config.base_url
+
+        return client_kwargs
+
+    @abstractmethod
+    def _create_client(self, client_kwargs: Dict[str, Any]) -> Any:
+        """Create the vendor SDK client."""
+        pass
+
+    @abstractmethod
+    def _build_request(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """Build the vendor request payload."""
+        pass
+
+    @abstractmethod
+    def _stream_text(
+        self, params: Dict[str, Any], final: List[ParsedResponse]
+    ) -> AsyncIterator[str]:
+        """
+        Stream text chunks for a request payload.
+
+        Args:
+            params: Vendor request payload
+            final: Receives the parsed content and usage once the stream ends
+
+        Yields:
+            Text chunks as they are generated
+        """
+        pass
+
+    @abstractmethod
+    async def _submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """
+        Submit request payloads to the vendor batch API.
+
+        Args:
+            requests: Vendor request payloads; each one's index is its custom_id
+
+        Returns:
+            Vendor batch ID
+        """
+        pass
+
+    @abstractmethod
+    async def _batch_ended(self, batch_id: str) -> bool:
+        """Check whether the vendor has finished processing a batch."""
+        pass
+
+    @abstractmethod
+    async def _batch_results(
+        self, batch_id: str
+    ) -> Dict[str, Union[ParsedResponse, str]]:
+        """
+        Fetch the results of a finished batch.
+
+        Returns:
+            Parsed response, or an error message, keyed by custom_id
+        """
+        pass
+
+    def _validate_config(self) -> None:
+        """Validate the API key and timeout."""
+        provider = self.get_provider_name()
+
+        if not self.config.api_key:
+            raise InvalidConfigError(
+                f"{self.VENDOR_NAME} API key is required", provider
+            )
+
+        if not self._KEY_RE.fullmatch(self.config.api_key):
+            raise InvalidConfigError(
+                f"{self.VENDOR_NAME} API key has an unrecognized format", provider
+            )
+
+        if self.config.timeout <= 0:
+            raise InvalidConfigError("Timeout must be positive", provider)
+
+    async def _generate_impl(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        **kwargs,
+    ) -> AIResponse:
+        """
+        Generate a response by accumulating the vendor stream.
+
+        The whole stream is retried on failure, which is safe because no
+        chunks have been handed to the caller.
+
+        Args:
+            prompt: Input prompt for the model
+            model: Vendor model to use
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            **kwargs: Request options accepted by _build_request
+
+        Returns:
+            AIResponse with generated content and metadata
+
+        Raises:
+            ProviderError: If API call fails
+            RateLimitError: If rate limits are exceeded
+            ModelNotFoundError: If model is not available
+        """
+        self.logger.debug(
+            "Generating with model=%s, temperature=%s", model, temperature
+        )
+
+        try:
+            request_params = self._build_request(
+                prompt, model, temperature, max_tokens, **kwargs
+            )
+            (
+                content,
+                prompt_tokens,
+                completion_tokens,
+                cache_read_tokens,
+                cache_write_tokens,
+                metadata,
+            ) = await self._call_with_retry(
+                self._collect_stream, request_params, self._rate_limit_exc
+            )
+            cost = self._calculate_cost(
+                model,
+                prompt_tokens,
+                completion_tokens,
+                cache_read_tokens,
+                cache_write_tokens,
+            )
+
+            # Cached input still counts towards the prompt size
+            prompt_tokens += cache_read_tokens + cache_write_tokens
+            total_tokens = prompt_tokens + completion_tokens
+
+            self.logger.info(
+                "Generated response: %d tokens (%d cached), $%.6f cost",
+                total_tokens,
+                cache_read_tokens,
+                cost,
+            )
+
+            return AIResponse(
+                content=content,
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=total_tokens,
+                model=model,
+                cost_usd=cost,
+                provider=self.get_provider_name(),
+                metadata={
+                    **metadata,
+                    "temperature": temperature,
+                    "max_tokens": max_tokens,
+                },
+            )
+
+        except Exception as e:
+            raise self._map_error(e, model)
+
+    async def stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        options: Optional[GenerateOptions] = None,
+        **kwargs,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a response from the vendor API as text chunks.
+
+        Streamed calls are not retried or cached, since chunks may already
+        have been consumed when an error occurs.
+
+        Args:
+            prompt: Input prompt for the model
+            model: Vendor model to use (defaults to DEFAULT_MODEL)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate
+            options: Typed options; overrides temperature and max_tokens
+            **kwargs: Request options accepted by _build_request
+
+        Yields:
+            Text chunks as they are generated
+
+        Raises:
+            ProviderError: If API call fails
+        """
+        model = model or self.DEFAULT_MODEL
+        temperature, max_tokens, kwargs = self._apply_options(
+            options, temperature, max_tokens, kwargs
+        )
+        request_params = self._build_request(
+            prompt, model, temperature, max_tokens, **kwargs
+        )
+
+        try:
+            async for text in self._stream_text(request_params, []):
+                yield text
+        except Exception as e:
+            raise self._map_error(e, model)
+
+    async def _collect_stream(self, **params: Any) -> ParsedResponse:
+        """Consume a streamed response and return its content and usage."""
+        final: List[ParsedResponse] = []
+        async for _ in self._stream_text(params, final):
+            pass
+        return final[0]
+
+    async def generate_batch(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        options: Optional[GenerateOptions] = None,
+        **kwargs,
+    ) -> List[AIResponse]:
+        """
+        Generate responses through the vendor batch API.
+
+        Batches are billed at half price but may take up to 24 hours, so this
+        suits offline sweeps rather than interactive use. The batch status is
+        polled with exponential backoff until processing ends.
+
+        Args:
+            prompts: Input prompts, one response per prompt
+            model: Vendor model to use (defaults to DEFAULT_MODEL)
+            temperature: Sampling temperature
+            max_tokens: Maximum tokens to generate per prompt
+            options: Typed options; overrides temperature and max_tokens
+            **kwargs: Request options accepted by _build_request
+
+        Returns:
+            List of AIResponse objects in the same order as prompts. Requests
+            that failed have empty content and an 'error' metadata entry.
+
+        Raises:
+            ProviderError: If the batch cannot be submitted or retrieved
+        """
+        model = model or self.DEFAULT_MODEL
+        temperature, max_tokens, kwargs = self._apply_options(
+            options, temperature, max_tokens, kwargs
+        )
+        requests = [
+            self._build_request(prompt, model, temperature, max_tokens, **kwargs)
+            for prompt in prompts
+        ]
+        sleep = asyncio.sleep
+
+        try:
+            batch_id = await self._submit_batch(requests)
+            self.logger.info(
+                "Submitted batch %s with %d requests", batch_id, len(requests)
+            )
+
+            delay = BATCH_POLL_INITIAL
+            while not await self._batch_ended(batch_id):
+                await sleep(delay)
+                delay = min(delay * 2, BATCH_POLL_MAX)
+
+            results = await self._batch_results(batch_id)
+        except Exception as e:
+            raise self._map_error(e, model)
+
+        provider = self.get_provider_name()
+        responses = []
+
+        for custom_id in map(str, range(len(prompts))):
+            result = results.get(custom_id, "No result returned for request")
+            metadata = {"batch": True, "batch_id": batch_id, "discount": BATCH_DISCOUNT}
+
+            if isinstance(result, str):
+                self.logger.warning(
+                    "Batch %s request %s failed: %s", batch_id, custom_id, result
+                )
+                responses.append(
+                    AIResponse(
+                        content="",
+                        prompt_tokens=0,
+                        completion_tokens=0,
+                        total_tokens=0,
+                        model=model,
+                        cost_usd=0.0,
+                        provider=provider,
+                        metadata={**metadata, "error": result},
+                    )
+                )
+                continue
+
+            (
+                content,
+                prompt_tokens,
+                completion_tokens,
+                cache_read_tokens,
+                cache_write_tokens,
+                vendor_metadata,
+            ) = result
+            cost = BATCH_DISCOUNT * self._calculate_cost(
+                model,
+                prompt_tokens,
+                completion_tokens,
+                cache_read_tokens,
+                cache_write_tokens,
+            )
+            prompt_tokens += cache_read_tokens + cache_write_tokens
+
+            responses.append(
+                AIResponse(
+                    content=content,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    total_tokens=prompt_tokens + completion_tokens,
+                    model=model,
+                    cost_usd=cost,
+                    provider=provider,
+                    metadata={
+                        **vendor_metadata,
+                        **metadata,
+                        "temperature": temperature,
+                        "max_tokens": max_tokens,
+                    },
+                )
+            )
+
+        return responses
+
+    def _map_error(self, error: Exception, model: str) -> ProviderError:
+        """Translate a vendor SDK exception into a platform error."""
+        provider = self.get_provider_name()
+
+        if isinstance(error, self._rate_limit_exc):
+            self.logger.warning("Rate limit exceeded: %s", error)
+            return RateLimitError(str(error), provider, model)
+
+        if isinstance(error, self._auth_exc):
+            self.logger.error("Authentication failed: %s", error)
+            return InvalidConfigError(f"Invalid API key: {error}", provider)
+
+        if isinstance(error, self._api_exc):
+            if "model" in str(error).lower() and "not found" in str(error).lower():
+                return ModelNotFoundError(
+                    f"Model {model} not found: {error}", provider, model
+                )
+            self.logger.error("%s API error: %s", self.VENDOR_NAME, error)
+            return ProviderError(f"API error: {error}", provider, model)
+
+        self.logger.error("Unexpected error: %s", error)
+        return ProviderError(f"Unexpected error: {error}", provider, model)
+
+    def _calculate_cost(
+        self,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0,
+    ) -> float:
+        """
+        Calculate cost based on token usage and model pricing.
+
+        Args:
+            model: Vendor model name
+            prompt_tokens: Uncached input tokens
+            completion_tokens: Output tokens
+            cache_read_tokens: Input tokens served from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
+
+        Returns:
+            Cost in USD
+        """
+        try:
+            input_rate, output_rate, cache_read_rate, cache_write_rate = (
+                self._PER_TOKEN[model]
+            )
+        except KeyError:
+            self.logger.warning(
+                "Unknown model '%s', using %s pricing", model, self.DEFAULT_MODEL
+            )
+            input_rate, output_rate, cache_read_rate, cache_write_rate = (
+                self._PER_TOKEN[self.DEFAULT_MODEL]
+            )
+
+        return (
+            input_rate * prompt_tokens
+            + output_rate * completion_tokens
+            + cache_read_rate * cache_read_tokens
+            + cache_write_rate * cache_write_tokens
+        )
+
+    def get_available_models(self) -> List[str]:
+        """Get list of supported models."""
+        return list(self.PRICING.keys())
+
+    def _estimate_prompt_tokens(self, prompt: str, model: str) -> int:
+        """Estimate prompt tokens at ~4 characters per token."""
+        return len(prompt) // 4
+
+    def estimate_cost(
+        self, prompt: str, model: str, max_tokens: Optional[int] = None
+    ) -> float:
+        """
+        Estimate cost for a generation request.
+
+        Args:
+            prompt: Input prompt
+            model: Vendor model name
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            Estimated cost in USD
+        """
+        return self._calculate_cost(
+            model=model,
+            prompt_tokens=self._estimate_prompt_tokens(prompt, model),
+            completion_tokens=max_tokens or 100,
+        )
@@ -0,0 +1,193 @@
+"""
+Response caching for the AI experimentation platform.
+
+This module provides an exact-match cache for deterministic provider calls so
+that identical requests can be answered without another API round-trip. The
+disk backend is shared by every process using the same cache directory.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+logger = logging.getLogger(__name__)
+
+# Supported values for the CACHE_BACKEND setting
+CACHE_BACKENDS = ("memory", "disk", "none")
+
+# Directory used by the disk backend when none is configured
+DEFAULT_CACHE_DIR = ".cache/responses"
+
+
+def make_cache_key(**parts: Any) -> str:
+    """
+    Build a stable cache key from request parameters.
+
+    Args:
+        **parts: Request fields that identify a response (model, prompt, ...)
+
+    Returns:
+        Hex digest uniquely identifying the request
+    """
+    if orjson is not None:
+        payload = orjson.dumps(
+            parts, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str
+        )
+    else:
+        payload = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache with per-entry expiry.
+
+    Entries are evicted least-recently-used first once ``max_entries`` is
+    reached, and are treated as missing once older than ``ttl`` seconds.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[float] = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses to keep
+            ttl: Seconds before an entry expires (None to never expire)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            stored_at, value = entry
+            if self.ttl is None or time.monotonic() - stored_at <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskResponseCache(ResponseCache):
+    """
+    Persistent cache stored in a local SQLite-backed diskcache directory.
+
+    Entries survive restarts and are shared between processes, so repeated
+    evaluation runs over the same prompts only pay for the first one.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, ttl: Optional[float] = 3600):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory holding the cache database
+            ttl: Seconds before an entry expires (None to never expire)
+
+        Raises:
+            ImportError: If diskcache is not installed
+        """
+        if diskcache is None:
+            raise ImportError(
+                "diskcache package not found. Install with: pip install diskcache"
+            )
+
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._store = diskcache.Cache(directory)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        value = self._store.get(key)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value; diskcache drops it once ttl has passed."""
+        self._store.set(key, value, expire=self.ttl)
+
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        self._store.clear()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+def create_cache(
+    backend: Optional[str], ttl: Optional[float] = 3600, directory: Optional[str] = None
+) -> Optional[ResponseCache]:
+    """
+    Create a response cache for the configured backend.
+
+    Args:
+        backend: Cache backend name (memory, disk or none)
+        ttl: Seconds before an entry expires
+        directory: Cache directory for the disk backend
+
+    Returns:
+        Cache instance, or None if caching is disabled
+
+    Raises:
+        ValueError: If backend is not supported
+        ImportError: If the disk backend is selected without diskcache
+    """
+    if not backend or backend == "none":
+        return None
+
+    if backend == "memory":
+        return ResponseCache(ttl=ttl)
+
+    if backend == "disk":
+        return DiskResponseCache(directory or DEFAULT_CACHE_DIR, ttl=ttl)
+
+    available = ", ".join(CACHE_BACKENDS)
+    raise ValueError(f"Unknown cache backend '{backend}'. Available: {available}")
@@ -5,120 +5,182 @@ This module provides a factory pattern for creating provider instances
 based on configuration and provider name.
 """
 
-from typing import Dict, Type, Optional
+import asyncio
 import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
+from ..utils.config import AppConfig
+from .anthropic_provider import AnthropicProvider
 from .base import BaseProvider, ProviderConfig
 from .openai_provider import OpenAIProvider
-from .anthropic_provider import AnthropicProvider
-from ..utils.config import AppConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _build_provider_config(api_key: Optional[str], config: AppConfig) -> ProviderConfig:
+    """Build a provider configuration from the shared application settings."""
+    return ProviderConfig(
+        api_key=api_key,
+        timeout=config.request_timeout,
+        max_retries=config.max_retries,
+        cache_backend=config.cache_backend,
+        cache_ttl=config.cache_ttl,
+        cache_dir=config.cache_dir,
+    )
+
+
 class ProviderFactory:
     """Factory for creating AI provider instances."""
-    
+
     # Registry of available providers
     _providers: Dict[str, Type[BaseProvider]] = {
         "openai": OpenAIProvider,
         "anthropic": AnthropicProvider,
     }
-    
+
+    # Provider configuration builders, one per registered provider
+    _CONFIG_BUILDERS: Dict[str, Callable[[AppConfig], ProviderConfig]] = {
+        "openai": lambda c: _build_provider_config(c.openai_api_key, c),
+        "anthropic": lambda c: _build_provider_config(c.anthropic_api_key, c),
+    }
+
+    # Provider instances reused across calls, keyed by event loop and provider
+    # configuration; connection pools cannot outlive the loop that opened them
+    _instances: Dict[Tuple[Any, ...], BaseProvider] = {}
+    _instances_lock = threading.Lock()
+
     @classmethod
     def create_provider(
-        cls, 
-        provider_name: str, 
-        config: AppConfig
+        cls, provider_name: str, config: AppConfig, shared: bool = True
     ) -> BaseProvider:
         """
-        Create a provider instance.
-        
+        Create a provider instance, or return the cached one.
+
+        Shared instances are reused for identical configuration within the
+        running event loop, so their HTTP connection pools stay warm across
+        requests, and are closed by aclose_all(). Each asyncio.run() gets its
+        own instances; an instance created outside any loop binds to the
+        first loop that uses it. Unshared instances belong to the caller,
+        which must close them.
+
         Args:
             provider_name: Name of the provider (openai, anthropic, etc.)
             config: Application configuration
-            
+            shared: Whether to reuse the factory's cached instance
+
         Returns:
             Initialized provider instance
-            
+
         Raises:
             ValueError: If provider is not available or not configured
         """
         if provider_name not in cls._providers:
             available = ", ".join(cls._providers.keys())
-            raise ValueError(f"Unknown provider '{provider_name}'. Available: {available}")
-        
+            raise ValueError(
+                f"Unknown provider '{provider_name}'. Available: {available}"
+            )
+
         # Create provider-specific config
         provider_config = cls._create_provider_config(provider_name, config)
-        
-        # Create and return provider instance
-        provider_class = cls._providers[provider_name]
-        return provider_class(provider_config)
-    
+
+        if not shared:
+            return cls._providers[provider_name](provider_config)
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        key = (
+            loop,
+            provider_name,
+            provider_config.api_key,
+            provider_config.base_url,
+            provider_config.organization,
+            provider_config.timeout,
+            provider_config.max_retries,
+            provider_config.cache_backend,
+            provider_config.cache_ttl,
+            provider_config.cache_dir,
+        )
+
+        with cls._instances_lock:
+            # Pools bound to a closed loop are unusable, so forget them
+            for stale in [
+                k for k in cls._instances if k[0] is not None and k[0].is_closed()
+            ]:
+                del cls._instances[stale]
+
+            provider = cls._instances.get(key)
+            if provider is None:
+                # Create and cache provider instance
+                provider_class = cls._providers[provider_name]
+                provider = provider_class(provider_config)
+                cls._instances[key] = provider
+
+        return provider
+
+    @classmethod
+    async def aclose_all(cls) -> None:
+        """Close all cached providers and release their connection pools."""
+        with cls._instances_lock:
+            providers = list(cls._instances.values())
+            cls._instances.clear()
+
+        for provider in providers:
+            await provider.aclose()
+
     @classmethod
     def _create_provider_config(
-        cls, 
-        provider_name: str, 
-        config: AppConfig
+        cls, provider_name: str, config: AppConfig
     ) -> ProviderConfig:
         """Create provider-specific configuration."""
-        
-        if provider_name == "openai":
-            if not config.openai_api_key:
-                raise ValueError("OpenAI API key not configured")
-            return ProviderConfig(
-                api_key=config.openai_api_key,
-                timeout=config.request_timeout,
-                max_retries=config.max_retries
-            )
-        
-        elif provider_name == "anthropic":
-            if not config.anthropic_api_key:
-                raise ValueError("Anthropic API key not configured")
-            return ProviderConfig(
-                api_key=config.anthropic_api_key,
-                timeout=config.request_timeout,
-                max_retries=config.max_retries
-            )
-        
-        else:
+        builder = cls._CONFIG_BUILDERS.get(provider_name)
+        if builder is None:
             raise ValueError(f"Unknown provider: {provider_name}")
-    
+
+        provider_config = builder(config)
+        if not provider_config.api_key:
+            raise ValueError(f"{provider_name} API key not configured")
+
+        return provider_config
+
     @classmethod
     def get_available_providers(cls, config: AppConfig) -> Dict[str, bool]:
         """
         Get available providers based on configuration.
-        
+
         Args:
             config: Application configuration
-            
+
         Returns:
             Dictionary mapping provider names to availability
         """
         return {
-            "openai": bool(config.openai_api_key),
-            "anthropic": bool(config.anthropic_api_key),
+            name: bool(builder(config).api_key)
+            for name, builder in cls._CONFIG_BUILDERS.items()
         }
-    
+
     @classmethod
     def get_default_provider(cls, config: AppConfig) -> str:
         """
         Get the default provider based on configuration.
-        
+
         Args:
             config: Application configuration
-            
+
         Returns:
             Name of the default provider
-            
+
         Raises:
             ValueError: If no providers are available
         """
         available = cls.get_available_providers(config)
-        
+
         if not any(available.values()):
             raise ValueError("No providers are configured")
-        
+
         # Prefer OpenAI if available, otherwise use first available
         if available["openai"]:
             return "openai"
@@ -126,4 +188,4 @@ class ProviderFactory:
             return "anthropic"
         else:
             # Return first available provider
-            return next(name for name, available in available.items() if available)
\ No newline at end of file
+            return next(name for name, available in available.items() if available)
@@ -5,236 +5,419 @@ This module provides integration with OpenAI's API including GPT-3.5, GPT-4,
 and other OpenAI models with proper error handling and cost calculation.
 """
 
-import asyncio
-from typing import List, Optional, Dict, Any
+import functools
+import json
 import logging
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
 
 try:
-    from openai import AsyncOpenAI
-    from openai.types.chat import ChatCompletion
+    import openai
+    from openai import APIError, AsyncOpenAI, AuthenticationError
     from openai import RateLimitError as OpenAIRateLimitError
-    from openai import AuthenticationError, APIError
 except ImportError:
     raise ImportError("OpenAI package not found. Install with: pip install openai")
 
-from .base import (
-    BaseProvider, 
-    AIResponse, 
-    ProviderConfig, 
-    ProviderError, 
-    RateLimitError, 
-    InvalidConfigError,
-    ModelNotFoundError
-)
+from .base import AIResponse, GenerateOptions, ParsedResponse, _ChatProvider
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 logger = logging.getLogger(__name__)
 
 
-class OpenAIProvider(BaseProvider):
+@functools.lru_cache(maxsize=16)
+def _get_encoding(model: str) -> Optional["tiktoken.Encoding"]:
+    """Load the tokenizer for a model once; None if it is unavailable."""
+    if tiktoken is None:
+        return None
+
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(
+            "Tokenizer unavailable for '%s', estimating tokens from length: %s",
+            model,
+            e,
+        )
+        return None
+
+
+class OpenAIProvider(_ChatProvider):
     """
     OpenAI provider implementation.
-    
+
     Supports GPT-3.5, GPT-4, and other OpenAI models with comprehensive
     error handling, cost calculation, and retry logic.
     """
-    
+
+    VENDOR_NAME = "OpenAI"
+    DEFAULT_MODEL = "gpt-3.5-turbo"
+
+    # Legacy sk-... keys as well as sk-proj-, sk-svcacct- and sk-None- keys
+    _KEY_RE = re.compile(r"sk-[A-Za-z0-9_\-]+")
+
+    _sdk = openai
+    _rate_limit_exc = OpenAIRateLimitError
+    _auth_exc = AuthenticationError
+    _api_exc = APIError
+
     # Current pricing per 1K tokens (as of July 2024)
     PRICING = {
-        'gpt-4': {'input': 0.03, 'output': 0.06},
-        'gpt-4-32k': {'input': 0.06, 'output': 0.12},
-        'gpt-4-turbo': {'input': 0.01, 'output': 0.03},
-        'gpt-4o': {'input': 0.005, 'output': 0.02},
-        'gpt-4o-mini': {'input': 0.00015, 'output': 0.0006},
-        'gpt-3.5-turbo': {'input': 0.0005, 'output': 0.0015},
-        'gpt-3.5-turbo-0125': {'input': 0.0005, 'output': 0.0015},
+        "gpt-4": {"input": 0.03, "output": 0.06},
+        "gpt-4-32k": {"input": 0.06, "output": 0.12},
+        "gpt-4-turbo": {"input": 0.01, "output": 0.03},
+        "gpt-4o": {"input": 0.005, "output": 0.02},
+        "gpt-4o-mini": {"input": 0.00015, "output": 0.0006},
+        "gpt-3.5-turbo": {"input": 0.0005, "output": 0.0015},
+        "gpt-3.5-turbo-0125": {"input": 0.0005, "output": 0.0015},
+        "gpt-3.5-turbo-instruct": {"input": 0.0015, "output": 0.002},
     }
-    
-    def __init__(self, config: ProviderConfig):
-        """Initialize OpenAI provider."""
-        super().__init__(config)
-        
-        # Initialize OpenAI client
-        client_kwargs = {
-            'api_key': config.api_key,
-            'timeout': config.timeout,
-            'max_retries': config.max_retries,
-        }
-        
-        if config.organization:
-            client_kwargs['organization'] = config.organization
-            
-        if config.base_url:
-            client_kwargs['base_url'] = config.base_url
-            
-        self.client = AsyncOpenAI(**client_kwargs)
-        
-        self.logger.info(f"OpenAI provider initialized with timeout={config.timeout}s")
-    
-    def _validate_config(self) -> None:
-        """Validate OpenAI configuration."""
-        if not self.config.api_key:
-            raise InvalidConfigError("OpenAI API key is required", "openai")
-        
-        if not self.config.api_key.startswith('sk-'):
-            raise InvalidConfigError("OpenAI API key must start with 'sk-'", "openai")
-        
-        if self.config.timeout <= 0:
-            raise InvalidConfigError("Timeout must be positive", "openai")
-    
-    async def generate(
+
+    # Models served by the completions endpoint, which accepts many prompts per request
+    COMPLETION_MODELS = {"gpt-3.5-turbo-instruct", "davinci-002", "babbage-002"}
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        """Build OpenAI client arguments, including the organization."""
+        client_kwargs = super()._client_kwargs()
+
+        if self.config.organization:
+            client_kwargs["organization"] = self.config.organization
+
+        return client_kwargs
+
+    def _create_client(self, client_kwargs: Dict[str, Any]) -> AsyncOpenAI:
+        """Create the OpenAI SDK client."""
+        return AsyncOpenAI(**client_kwargs)
+
+    def _build_request(
         self,
         prompt: str,
-        model: str = 'gpt-3.5-turbo',
+        model: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        system: Optional[str] = None,
+        history: Optional[List[Dict[str, Any]]] = None,
+        top_p: Optional[float] = None,
+        stop: Optional[Sequence[str]] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        """
+        Build chat completion parameters, stable prefix first.
+
+        The system prompt and prior turns are sent first so repeated calls
+        share a prefix that OpenAI caches automatically.
+        """
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.extend(history or [])
+        messages.append({"role": "user", "content": prompt})
+
+        request_params = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            **kwargs,
+        }
+
+        if max_tokens:
+            request_params["max_tokens"] = max_tokens
+        if top_p is not None:
+            request_params["top_p"] = top_p
+        if stop:
+            request_params["stop"] = list(stop)
+
+        return request_params
+
+    async def _stream_text(
+        self, params: Dict[str, Any], final: List[ParsedResponse]
+    ) -> AsyncIterator[str]:
+        """
+        Stream content deltas from the chat completions endpoint.
+
+        Usage arrives in a trailing chunk with no choices, which the API only
+        sends when include_usage is requested.
+        """
+        response = await self.client.chat.completions.create(
+            stream=True, stream_options={"include_usage": True}, **params
+        )
+
+        parts = []
+        usage = finish_reason = response_id = created = None
+
+        async for chunk in response:
+            response_id, created = chunk.id, chunk.created
+            if chunk.usage:
+                usage = chunk.usage
+            if chunk.choices:
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                if choice.delta.content:
+                    parts.append(choice.delta.content)
+                    yield choice.delta.content
+
+        if usage is None:
+            self.logger.warning(
+                "Stream ended without usage; token counts and cost will be zero"
+            )
+
+        final.append(
+            (
+                "".join(parts),
+                usage.prompt_tokens if usage else 0,
+                usage.completion_tokens if usage else 0,
+                0,
+                0,
+                {
+                    "finish_reason": finish_reason,
+                    "response_id": response_id,
+                    "created": created,
+                },
+            )
+        )
+
+    async def _submit_batch(self, requests: List[Dict[str, Any]]) -> str:
+        """Upload requests as a JSONL file and create a chat completions batch."""
+        lines = [
+            json.dumps(
+                {
+                    "custom_id": str(i),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": params,
+                }
+            )
+            for i, params in enumerate(requests)
+        ]
+
+        batch_file = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        return batch.id
+
+    async def _batch_ended(self, batch_id: str) -> bool:
+        """Check whether a batch has reached a terminal status."""
+        batch = await self.client.batches.retrieve(batch_id)
+        return batch.status in ("completed", "failed", "expired", "cancelled")
+
+    async def _batch_results(
+        self, batch_id: str
+    ) -> Dict[str, Union[ParsedResponse, str]]:
+        """Download the batch output and error files and parse each line."""
+        batch = await self.client.batches.retrieve(batch_id)
+        results: Dict[str, Union[ParsedResponse, str]] = {}
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                body = response.get("body") or {}
+
+                if entry.get("error") or response.get("status_code") != 200:
+                    results[entry["custom_id"]] = str(
+                        entry.get("error") or body.get("error")
+                    )
+                    continue
+
+                choice = body["choices"][0]
+                results[entry["custom_id"]] = (
+                    choice["message"]["content"],
+                    body["usage"]["prompt_tokens"],
+                    body["usage"]["completion_tokens"],
+                    0,
+                    0,
+                    {
+                        "finish_reason": choice["finish_reason"],
+                        "response_id": body["id"],
+                        "created": body["created"],
+                    },
+                )
+
+        return results
+
+    async def embed(
+        self, text: str, model: str = "text-embedding-3-small"
+    ) -> List[float]:
+        """
+        Get an embedding vector for text.
+
+        Args:
+            text: Text to embed
+            model: OpenAI embedding model to use
+
+        Returns:
+            Embedding vector
+        """
+        response = await self.client.embeddings.create(model=model, input=text)
+        return response.data[0].embedding
+
+    async def generate_many(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        max_concurrency: int = 5,
         temperature: float = 0.7,
         max_tokens: Optional[int] = None,
-        **kwargs
-    ) -> AIResponse:
+        options: Optional[GenerateOptions] = None,
+        **kwargs,
+    ) -> List[AIResponse]:
         """
-        Generate response using OpenAI's API.
-        
+        Generate responses for several prompts.
+
+        Completion models receive every prompt in a single request, which
+        saves requests-per-minute quota. Chat models fall back to concurrent
+        individual requests.
+
         Args:
-            prompt: Input prompt for the model
+            prompts: Input prompts, one response per prompt
             model: OpenAI model to use
+            max_concurrency: Maximum chat requests in flight at once
             temperature: Sampling temperature (0.0 to 2.0)
-            max_tokens: Maximum tokens to generate
+            max_tokens: Maximum tokens to generate per prompt
+            options: Typed options; overrides temperature and max_tokens
             **kwargs: Additional OpenAI parameters
-            
+
         Returns:
-            AIResponse with generated content and metadata
-            
+            List of AIResponse objects in the same order as prompts
+
         Raises:
             ProviderError: If API call fails
-            RateLimitError: If rate limits are exceeded
-            ModelNotFoundError: If model is not available
         """
-        self.logger.debug(f"Generating with model={model}, temperature={temperature}")
-        
-        try:
-            # Prepare request parameters
-            request_params = {
-                'model': model,
-                'messages': [{'role': 'user', 'content': prompt}],
-                'temperature': temperature,
-                **kwargs
-            }
-            
-            if max_tokens:
-                request_params['max_tokens'] = max_tokens
-            
-            # Make API call with retry logic
-            response = await self._make_api_call(request_params)
-            
-            # Extract response data
-            content = response.choices[0].message.content
-            usage = response.usage
-            
-            # Calculate cost
-            cost = self._calculate_cost(
-                model=model,
-                prompt_tokens=usage.prompt_tokens,
-                completion_tokens=usage.completion_tokens
-            )
-            
-            # Create standardized response
-            ai_response = AIResponse(
-                content=content,
-                prompt_tokens=usage.prompt_tokens,
-                completion_tokens=usage.completion_tokens,
-                total_tokens=usage.total_tokens,
-                model=model,
-                cost_usd=cost,
-                provider="openai",
-                metadata={
-                    'finish_reason': response.choices[0].finish_reason,
-                    'response_id': response.id,
-                    'created': response.created,
-                    'temperature': temperature,
-                    'max_tokens': max_tokens,
-                }
+        model = model or self.DEFAULT_MODEL
+        if not prompts:
+            return []
+
+        if model not in self.COMPLETION_MODELS:
+            return await super().generate_many(
+                prompts,
+                model,
+                max_concurrency,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                options=options,
+                **kwargs,
             )
-            
-            self.logger.info(
-                f"Generated response: {usage.total_tokens} tokens, "
-                f"${cost:.6f} cost, finish_reason={response.choices[0].finish_reason}"
+
+        temperature, max_tokens, kwargs = self._apply_options(
+            options, temperature, max_tokens, kwargs
+        )
+
+        # The completions API has no chat roles to carry these
+        for field in ("system", "history"):
+            if kwargs.pop(field, None) is not None:
+                self.logger.warning("Ignoring %s for completion model %s", field, model)
+
+        request_params = {
+            "model": model,
+            "prompt": prompts,
+            "temperature": temperature,
+            **kwargs,
+        }
+        if max_tokens:
+            request_params["max_tokens"] = max_tokens
+
+        try:
+            response = await self._call_with_retry(
+                self.client.completions.create, request_params, self._rate_limit_exc
             )
-            
-            return ai_response
-            
-        except OpenAIRateLimitError as e:
-            self.logger.warning(f"Rate limit exceeded: {e}")
-            raise RateLimitError(str(e), "openai", model)
-            
-        except AuthenticationError as e:
-            self.logger.error(f"Authentication failed: {e}")
-            raise InvalidConfigError(f"Invalid API key: {e}", "openai")
-            
-        except APIError as e:
-            if "model" in str(e).lower() and "not found" in str(e).lower():
-                raise ModelNotFoundError(f"Model {model} not found: {e}", "openai", model)
-            self.logger.error(f"OpenAI API error: {e}")
-            raise ProviderError(f"API error: {e}", "openai", model)
-            
         except Exception as e:
-            self.logger.error(f"Unexpected error: {e}")
-            raise ProviderError(f"Unexpected error: {e}", "openai", model)
-    
-    async def _make_api_call(self, params: Dict[str, Any]) -> ChatCompletion:
-        """Make API call with exponential backoff retry."""
-        for attempt in range(self.config.max_retries + 1):
-            try:
-                return await self.client.chat.completions.create(**params)
-            except OpenAIRateLimitError:
-                if attempt == self.config.max_retries:
-                    raise
-                wait_time = 2 ** attempt
-                self.logger.warning(f"Rate limited, retrying in {wait_time}s (attempt {attempt + 1})")
-                await asyncio.sleep(wait_time)
-            except Exception:
-                if attempt == self.config.max_retries:
-                    raise
-                wait_time = min(2 ** attempt, 60)
-                self.logger.warning(f"API call failed, retrying in {wait_time}s (attempt {attempt + 1})")
-                await asyncio.sleep(wait_time)
-    
-    def _calculate_cost(self, model: str, prompt_tokens: int, completion_tokens: int) -> float:
-        """Calculate cost based on token usage and model pricing."""
-        if model not in self.PRICING:
-            self.logger.warning(f"Unknown model '{model}', using gpt-3.5-turbo pricing")
-            model = 'gpt-3.5-turbo'
-        
-        pricing = self.PRICING[model]
-        input_cost = (prompt_tokens / 1000) * pricing['input']
-        output_cost = (completion_tokens / 1000) * pricing['output']
-        
-        return input_cost + output_cost
-    
-    def get_available_models(self) -> List[str]:
-        """Get list of supported OpenAI models."""
-        return list(self.PRICING.keys())
-    
-    def estimate_cost(
-        self, 
-        prompt: str, 
-        model: str, 
-        max_tokens: Optional[int] = None
-    ) -> float:
+            raise self._map_error(e, model)
+
+        # Choices may arrive in any order; index maps each back to its prompt
+        choices = [None] * len(prompts)
+        for choice in response.choices:
+            choices[choice.index] = choice
+
+        texts = [choice.text if choice else "" for choice in choices]
+        prompt_shares = self._split_tokens(
+            response.usage.prompt_tokens, [len(p) for p in prompts]
+        )
+        completion_shares = self._split_tokens(
+            response.usage.completion_tokens, [len(t) for t in texts]
+        )
+
+        provider = self.get_provider_name()
+        responses = []
+        for text, choice, prompt_tokens, completion_tokens in zip(
+            texts, choices, prompt_shares, completion_shares
+        ):
+            responses.append(
+                AIResponse(
+                    content=text,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    total_tokens=prompt_tokens + completion_tokens,
+                    model=model,
+                    cost_usd=self._calculate_cost(
+                        model, prompt_tokens, completion_tokens
+                    ),
+                    provider=provider,
+                    metadata={
+                        "finish_reason": choice.finish_reason if choice else None,
+                        "response_id": response.id,
+                        "batch_size": len(prompts),
+                        "temperature": temperature,
+                        "max_tokens": max_tokens,
+                    },
+                )
+            )
+
+        self.logger.info(
+            "Generated %d completions in one request: %d tokens",
+            len(prompts),
+            response.usage.total_tokens,
+        )
+
+        return responses
+
+    @staticmethod
+    def _split_tokens(total: int, weights: List[int]) -> List[int]:
+        """Split a token count across items in proportion to their weights."""
+        if not weights:
+            return []
+
+        if not any(weights):
+            weights = [1] * len(weights)
+
+        weight_sum = sum(weights)
+        shares = [total * weight // weight_sum for weight in weights]
+        shares[-1] += total - sum(shares)
+        return shares
+
+    def count_tokens(self, prompt: str, model: str) -> int:
         """
-        Estimate cost for a generation request.
-        
+        Count prompt tokens with the model's tokenizer.
+
+        Falls back to ~4 characters per token when tiktoken is not installed
+        or the encoding cannot be loaded.
+
         Args:
             prompt: Input prompt
             model: OpenAI model name
-            max_tokens: Maximum tokens to generate
-            
+
         Returns:
-            Estimated cost in USD
+            Number of prompt tokens
         """
-        # Rough estimation: ~4 characters per token
-        estimated_prompt_tokens = len(prompt) // 4
-        estimated_completion_tokens = max_tokens or 100
-        
-        return self._calculate_cost(
-            model=model,
-            prompt_tokens=estimated_prompt_tokens,
-            completion_tokens=estimated_completion_tokens
-        ) 
\ No newline at end of file
+        encoding = _get_encoding(model)
+        if encoding is None:
+            return len(prompt) // 4
+        return len(encoding.encode(prompt))
+
+    def _estimate_prompt_tokens(self, prompt: str, model: str) -> int:
+        """Count prompt tokens with the model's tokenizer."""
+        return self.count_tokens(prompt, model)
@@ -0,0 +1,152 @@
+"""
+Semantic response cache for the AI experimentation platform.
+
+This module provides a cache that matches prompts by embedding similarity
+rather than exact text, so rephrased requests can reuse an earlier response.
+"""
+
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("numpy package not found. Install with: pip install numpy")
+
+logger = logging.getLogger(__name__)
+
+EmbedFunction = Callable[[str], Awaitable[List[float]]]
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache keyed by prompt embeddings.
+
+    Embeddings are normalized and stored as rows of a single matrix,
+    preallocated to ``max_entries`` rows and filled as a ring buffer, so a
+    lookup is one vectorized dot product against every cached prompt and an
+    insert overwrites one row in place.
+    Entries are split into partitions, one per set of request settings
+    (model, system prompt, max_tokens, ...), and a cached response is only
+    returned for the same partition when its cosine similarity is at or
+    above ``threshold``.
+    """
+
+    def __init__(
+        self, embed: EmbedFunction, threshold: float = 0.92, max_entries: int = 1024
+    ):
+        """
+        Initialize the semantic cache.
+
+        Args:
+            embed: Coroutine function returning the embedding for a text
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of responses to keep (oldest evicted)
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._partitions = np.empty(max_entries, dtype=object)
+        self._responses: List[object] = [None] * max_entries
+        self._count = 0
+        self._next = 0
+
+    async def query_vector(self, prompt: str) -> Optional[np.ndarray]:
+        """
+        Embed a prompt for use with get() and set().
+
+        Args:
+            prompt: Input prompt
+
+        Returns:
+            Normalized embedding, or None if embedding failed
+        """
+        try:
+            return await self._embed_normalized(prompt)
+        except Exception as e:
+            logger.warning("Semantic cache skipped, embedding failed: %s", e)
+            return None
+
+    async def get(
+        self, prompt: str, partition: str, vector: Optional[np.ndarray] = None
+    ) -> Optional[object]:
+        """
+        Find a cached response for a semantically similar prompt.
+
+        Args:
+            prompt: Input prompt
+            partition: Key of the request settings the response must share
+            vector: Embedding from query_vector(), to avoid embedding again
+
+        Returns:
+            Cached response, or None if nothing is similar enough
+        """
+        if not self._count:
+            self.misses += 1
+            return None
+
+        if vector is None:
+            vector = await self.query_vector(prompt)
+            if vector is None:
+                self.misses += 1
+                return None
+
+        count = self._count
+        scores = self._vectors[:count] @ vector
+        scores[self._partitions[:count] != partition] = -1.0
+
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            self.hits += 1
+            logger.debug("Semantic cache hit (similarity=%.3f)", scores[best])
+            return self._responses[best]
+
+        self.misses += 1
+        return None
+
+    async def set(
+        self,
+        prompt: str,
+        partition: str,
+        response: object,
+        vector: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Store a response under the embedding of its prompt.
+
+        Args:
+            prompt: Input prompt the response was generated for
+            partition: Key of the request settings used for generation
+            response: Response to cache
+            vector: Embedding from query_vector(), to avoid embedding again
+        """
+        if vector is None:
+            vector = await self.query_vector(prompt)
+            if vector is None:
+                return
+
+        # Allocated on first use, once the embedding dimension is known
+        if self._vectors is None:
+            self._vectors = np.empty(
+                (self.max_entries, vector.shape[0]), dtype=np.float32
+            )
+
+        # Once full, the write index wraps onto the oldest entry
+        index = self._next
+        self._vectors[index] = vector
+        self._partitions[index] = partition
+        self._responses[index] = response
+        self._next = (index + 1) % self.max_entries
+        self._count = min(self._count + 1, self.max_entries)
+
+    async def _embed_normalized(self, text: str) -> np.ndarray:
+        """Embed text and scale it to unit length."""
+        vector = np.asarray(await self.embed(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def __len__(self) -> int:
+        return self._count
@@ -8,4 +8,4 @@ to extend their capabilities with web search, calculations, and other functions.
 from .base import BaseTool
 from .web_search import WebSearchTool
 
-__all__ = ["BaseTool", "WebSearchTool"]
\ No newline at end of file
+__all__ = ["BaseTool", "WebSearchTool"]
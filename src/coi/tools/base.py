@@ -4,10 +4,10 @@ Base class for AI tools.
 This module provides the abstract base class that all AI tools must implement.
 """
 
+import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
 from dataclasses import dataclass
-import logging
+from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +15,7 @@ logger = logging.getLogger(__name__)
 @dataclass
 class ToolResult:
     """Result of a tool execution."""
+
     success: bool
     content: str
     error: Optional[str] = None
@@ -24,14 +25,14 @@ class ToolResult:
 class BaseTool(ABC):
     """
     Abstract base class for AI tools.
-    
+
     All tools must implement the execute method and provide tool metadata.
     """
-    
+
     def __init__(self, name: str, description: str):
         """
         Initialize the tool.
-        
+
         Args:
             name: Tool name for AI model reference
             description: Tool description for AI model understanding
@@ -39,29 +40,29 @@ class BaseTool(ABC):
         self.name = name
         self.description = description
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
-    
+
     @abstractmethod
     async def execute(self, **kwargs) -> ToolResult:
         """
         Execute the tool with given parameters.
-        
+
         Args:
             **kwargs: Tool-specific parameters
-            
+
         Returns:
             ToolResult with execution outcome
         """
         pass
-    
+
     @abstractmethod
     def get_schema(self) -> Dict[str, Any]:
         """
         Get the JSON schema for this tool's parameters.
-        
+
         Returns:
             OpenAI function calling schema
         """
         pass
-    
+
     def __str__(self) -> str:
-        return f"{self.name}: {self.description}"
\ No newline at end of file
+        return f"{self.name}: {self.description}"
@@ -5,186 +5,275 @@ This module provides a web search tool that can be used by AI models
 to search the internet for current information.
 """
 
-import json
 import asyncio
-from typing import Dict, Any, Optional
+import json
 import logging
+import random
+from dataclasses import replace
+from itertools import islice
+from typing import Any, Dict, Optional
+
+import httpx
 
 try:
-    import requests
+    import orjson
 except ImportError:
-    raise ImportError("requests package not found. Install with: pip install requests")
+    orjson = None
 
+from ..providers.cache import ResponseCache
+from ..utils.rate_limit import AsyncRateLimiter
 from .base import BaseTool, ToolResult
 
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing for search requests; DuckDuckGo is a single host
+SEARCH_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=10)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
 
 class WebSearchTool(BaseTool):
     """
     Web search tool using DuckDuckGo Instant Answer API.
-    
+
     This tool allows AI models to search the web for current information
     without requiring API keys or complex setup.
     """
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        requests_per_second: float = 10.0,
+        max_retries: int = 2,
+        cache_size: int = 512,
+        cache_ttl: Optional[float] = 300,
+    ):
+        """
+        Initialize the web search tool.
+
+        Args:
+            max_concurrency: Maximum searches in flight at once
+            requests_per_second: Sustained rate of outbound searches
+            max_retries: Retries for rate-limited or failed searches
+            cache_size: Maximum number of query results to keep (0 disables)
+            cache_ttl: Seconds before a cached result expires
+        """
         super().__init__(
             name="web_search",
-            description="Search the web for current information, news, and facts"
+            description="Search the web for current information, news, and facts",
         )
         self.base_url = "https://api.duckduckgo.com/"
         self.timeout = 10
-    
-    async def execute(self, query: str, **kwargs) -> ToolResult:
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self._limiter = AsyncRateLimiter(requests_per_second)
+        self._cache = (
+            ResponseCache(max_entries=cache_size, ttl=cache_ttl) if cache_size else None
+        )
+
+        self._schema = {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string",
+                            "description": "Search query to find information about",
+                        }
+                    },
+                    "required": ["query"],
+                },
+            },
+        }
+
+        # Created on first use so they bind to the event loop running the search
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=SEARCH_POOL_LIMITS,
+                timeout=self.timeout,
+                headers={"User-Agent": "AI-Experimentation-Platform/1.0"},
+            )
+        return self._client
+
+    async def _fetch(self, params: Dict[str, str]) -> httpx.Response:
         """
-        Execute web search.
-        
+        Send a search request, bounded in concurrency and rate.
+
+        Rate-limited and server-error responses are retried with jittered
+        exponential backoff, sleeping outside the concurrency slot.
+
         Args:
-            query: Search query string
-            **kwargs: Additional parameters (unused)
-            
+            params: Query parameters for the search API
+
         Returns:
-            ToolResult with search results
+            The successful HTTP response
+
+        Raises:
+            httpx.HTTPError: If the request still fails after all retries
         """
-        try:
-            self.logger.debug(f"Searching for: {query}")
-            
-            # Use asyncio to run the blocking requests call
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, self._search, query)
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Web search failed: {e}")
-            return ToolResult(
-                success=False,
-                content="",
-                error=f"Search failed: {str(e)}"
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        sleep = asyncio.sleep
+
+        for attempt in range(self.max_retries + 1):
+            # Wait for a rate token before taking a concurrency slot
+            async with self._limiter, self._semaphore:
+                response = await self._get_client().get(self.base_url, params=params)
+
+            if (
+                response.status_code not in RETRYABLE_STATUS
+                or attempt == self.max_retries
+            ):
+                response.raise_for_status()
+                return response
+
+            wait_time = 2**attempt + random.random()
+            self.logger.warning(
+                f"Search returned {response.status_code}, retrying: "
+                f"attempt={attempt + 1} wait_ms={wait_time * 1000:.0f}"
             )
-    
-    def _search(self, query: str) -> ToolResult:
+            await sleep(wait_time)
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and release its pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def execute(self, query: str, **kwargs) -> ToolResult:
         """
-        Perform synchronous web search.
-        
+        Execute web search.
+
         Args:
             query: Search query string
-            
+            **kwargs: Additional parameters (unused)
+
         Returns:
             ToolResult with search results
         """
+        self.logger.debug(f"Searching for: {query}")
+
+        cache_key = query.strip().lower()
+        if self._cache is not None:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug(
+                    f"Search cache hit: hit_rate={self._cache.hit_rate:.2f}"
+                )
+                # A copy, so callers never share or mutate the cached metadata
+                return replace(
+                    cached, metadata={**(cached.metadata or {}), "query": query}
+                )
+
         try:
             # DuckDuckGo Instant Answer API
             params = {
-                'q': query,
-                'format': 'json',
-                'no_html': '1',
-                'skip_disambig': '1'
+                "q": query,
+                "format": "json",
+                "no_html": "1",
+                "skip_disambig": "1",
             }
-            
-            response = requests.get(
-                self.base_url,
-                params=params,
-                timeout=self.timeout,
-                headers={
-                    'User-Agent': 'AI-Experimentation-Platform/1.0'
-                }
+
+            response = await self._fetch(params)
+            data = (
+                orjson.loads(response.content)
+                if orjson is not None
+                else response.json()
             )
-            response.raise_for_status()
-            
-            data = response.json()
-            
+
             # Extract relevant information
             results = []
-            
+
             # Abstract (direct answer)
-            if data.get('Abstract'):
+            if data.get("Abstract"):
                 results.append(f"Answer: {data['Abstract']}")
-                if data.get('AbstractURL'):
+                if data.get("AbstractURL"):
                     results.append(f"Source: {data['AbstractURL']}")
-            
+
             # Definition
-            if data.get('Definition'):
+            if data.get("Definition"):
                 results.append(f"Definition: {data['Definition']}")
-                if data.get('DefinitionURL'):
+                if data.get("DefinitionURL"):
                     results.append(f"Source: {data['DefinitionURL']}")
-            
+
             # Related topics
-            if data.get('RelatedTopics'):
+            related_topics = data.get("RelatedTopics") or ()
+            if related_topics:
                 topics = []
-                for topic in data['RelatedTopics'][:3]:  # Limit to 3 topics
-                    if isinstance(topic, dict) and topic.get('Text'):
-                        topics.append(topic['Text'])
+                for topic in islice(related_topics, 3):  # Limit to 3 topics
+                    if isinstance(topic, dict) and topic.get("Text"):
+                        topics.append(topic["Text"])
                 if topics:
                     results.append(f"Related: {' | '.join(topics)}")
-            
+
             # Infobox
-            if data.get('Infobox') and data['Infobox'].get('content'):
+            if data.get("Infobox") and data["Infobox"].get("content"):
                 info_items = []
-                for item in data['Infobox']['content'][:3]:  # Limit to 3 items
-                    if item.get('label') and item.get('value'):
+                for item in islice(data["Infobox"]["content"], 3):  # Limit to 3 items
+                    if item.get("label") and item.get("value"):
                         info_items.append(f"{item['label']}: {item['value']}")
                 if info_items:
                     results.append(f"Info: {' | '.join(info_items)}")
-            
+
             if results:
                 content = "\\n".join(results)
             else:
-                content = f"No direct answers found for '{query}'. Try rephrasing your search."
-            
-            return ToolResult(
+                content = (
+                    f"No direct answers found for '{query}'. "
+                    "Try rephrasing your search."
+                )
+
+            result = ToolResult(
                 success=True,
                 content=content,
                 metadata={
-                    'query': query,
-                    'source': 'DuckDuckGo',
-                    'has_abstract': bool(data.get('Abstract')),
-                    'has_definition': bool(data.get('Definition')),
-                    'related_topics_count': len(data.get('RelatedTopics', []))
-                }
+                    "query": query,
+                    "source": "DuckDuckGo",
+                    "has_abstract": bool(data.get("Abstract")),
+                    "has_definition": bool(data.get("Definition")),
+                    "related_topics_count": len(related_topics),
+                },
             )
-            
-        except requests.RequestException as e:
+
+            # Only successful results are cached so failures are retried
+            if self._cache is not None:
+                self._cache.set(cache_key, result)
+
+            return result
+
+        except httpx.HTTPError as e:
             return ToolResult(
-                success=False,
-                content="",
-                error=f"Network error: {str(e)}"
+                success=False, content="", error=f"Network error: {str(e)}"
             )
-        except json.JSONDecodeError as e:
+        except json.JSONDecodeError as e:  # orjson.JSONDecodeError subclasses it
             return ToolResult(
                 success=False,
                 content="",
-                error=f"Failed to parse search results: {str(e)}"
+                error=f"Failed to parse search results: {str(e)}",
             )
         except Exception as e:
+            self.logger.error(f"Web search failed: {e}")
             return ToolResult(
-                success=False,
-                content="",
-                error=f"Unexpected error: {str(e)}"
+                success=False, content="", error=f"Search failed: {str(e)}"
             )
-    
+
     def get_schema(self) -> Dict[str, Any]:
         """
         Get the JSON schema for this tool's parameters.
-        
+
+        The schema is built once per tool and shared between calls, so
+        callers must not modify it.
+
         Returns:
             OpenAI function calling schema
         """
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Search query to find information about"
-                        }
-                    },
-                    "required": ["query"]
-                }
-            }
-        }
\ No newline at end of file
+        return self._schema
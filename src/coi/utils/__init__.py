@@ -3,4 +3,4 @@ Utility functions and classes for the AI experimentation platform.
 
 This package contains helper functions for logging, configuration,
 and other common utilities used across the platform.
-""" 
\ No newline at end of file
+"""
@@ -6,89 +6,122 @@ This module handles loading configuration from environment variables,
 """
 
 import os
-from typing import Optional, Dict, Any
+import sys
 from dataclasses import dataclass
-from pathlib import Path
+from functools import lru_cache
+from typing import Any, Dict, Optional
 
 try:
     from dotenv import load_dotenv
 except ImportError:
     load_dotenv = None
 
+# Use slotted dataclasses where supported (Python 3.10+) to drop per-instance __dict__
+DATACLASS_SLOTS: Dict[str, bool] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class AppConfig:
-    """Main application configuration."""
+    """
+    Main application configuration.
+
+    Instances are immutable because load_config shares one across callers.
+    """
+
     # Logging
     log_level: str = "INFO"
     log_file: Optional[str] = None
     enable_debug: bool = False
-    
+
     # API Keys
     openai_api_key: Optional[str] = None
     anthropic_api_key: Optional[str] = None
     azure_openai_api_key: Optional[str] = None
     azure_openai_endpoint: Optional[str] = None
-    
+
     # Provider Settings
     default_model: str = "gpt-3.5-turbo"
     default_temperature: float = 0.7
     default_max_tokens: int = 150
     request_timeout: int = 30
     max_retries: int = 3
-    
+
+    # Response Cache
+    cache_backend: str = "memory"
+    cache_ttl: int = 3600
+    cache_dir: str = ".cache/responses"
+
+    # Web Search
+    web_search_concurrency: int = 8
+    web_search_rate: float = 10.0
+
+    # Web Server
+    web_workers: int = 4
+    cors_origins: str = "*"
+
     # Development
     environment: str = "development"
 
 
+@lru_cache(maxsize=1)
 def load_config(env_file: Optional[str] = None) -> AppConfig:
     """
     Load configuration from environment variables and .env file.
-    
+
+    The parsed configuration is cached, so repeated calls return the same
+    instance. Call ``load_config.cache_clear()`` to re-read the environment.
+
     Args:
         env_file: Path to .env file (defaults to .env in current directory)
-        
+
     Returns:
         AppConfig instance with loaded configuration
     """
-    # Load .env file if available
-    if load_dotenv and env_file is None:
-        env_file = ".env"
-    
-    if load_dotenv and env_file and Path(env_file).exists():
-        load_dotenv(env_file)
-    
+    # Load .env file if available; load_dotenv ignores a missing file
+    if load_dotenv:
+        load_dotenv(env_file or ".env", override=False)
+
+    env = os.environ
     return AppConfig(
         # Logging
-        log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
-        log_file=os.getenv("LOG_FILE"),
-        enable_debug=os.getenv("DEBUG", "false").lower() == "true",
-        
+        log_level=env.get("LOG_LEVEL", "INFO").upper(),
+        log_file=env.get("LOG_FILE"),
+        enable_debug=env.get("DEBUG", "false").lower() == "true",
         # API Keys
-        openai_api_key=os.getenv("OPENAI_API_KEY"),
-        anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
-        azure_openai_api_key=os.getenv("AZURE_OPENAI_API_KEY"),
-        azure_openai_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT"),
-        
+        openai_api_key=env.get("OPENAI_API_KEY"),
+        anthropic_api_key=env.get("ANTHROPIC_API_KEY"),
+        azure_openai_api_key=env.get("AZURE_OPENAI_API_KEY"),
+        azure_openai_endpoint=env.get("AZURE_OPENAI_ENDPOINT"),
         # Provider Settings
-        default_model=os.getenv("DEFAULT_MODEL", "gpt-3.5-turbo"),
-        default_temperature=float(os.getenv("DEFAULT_TEMPERATURE", "0.7")),
-        default_max_tokens=int(os.getenv("DEFAULT_MAX_TOKENS", "150")),
-        request_timeout=int(os.getenv("REQUEST_TIMEOUT", "30")),
-        max_retries=int(os.getenv("MAX_RETRIES", "3")),
-        
+        default_model=env.get("DEFAULT_MODEL", "gpt-3.5-turbo"),
+        default_temperature=float(env.get("DEFAULT_TEMPERATURE", "0.7")),
+        default_max_tokens=int(env.get("DEFAULT_MAX_TOKENS", "150")),
+        request_timeout=int(env.get("REQUEST_TIMEOUT", "30")),
+        max_retries=int(env.get("MAX_RETRIES", "3")),
+        # Response Cache
+        cache_backend=env.get("CACHE_BACKEND", "memory").lower(),
+        cache_ttl=int(env.get("CACHE_TTL", "3600")),
+        cache_dir=env.get("CACHE_DIR", ".cache/responses"),
+        # Web Search
+        web_search_concurrency=int(env.get("WEB_SEARCH_CONCURRENCY", "8")),
+        web_search_rate=float(env.get("WEB_SEARCH_RATE", "10")),
+        # Web Server
+        web_workers=int(env.get("WEB_WORKERS", "4")),
+        cors_origins=env.get("CORS_ORIGINS", "*"),
         # Development
-        environment=os.getenv("ENVIRONMENT", "development"),
+        environment=env.get("ENVIRONMENT", "development"),
     )
 
 
 def get_available_providers(config: AppConfig) -> Dict[str, bool]:
     """
     Check which providers are available based on configuration.
-    
+
     Args:
         config: Application configuration
-        
+
     Returns:
         Dictionary mapping provider names to availability
     """
@@ -102,26 +135,38 @@ def get_available_providers(config: AppConfig) -> Dict[str, bool]:
 def validate_config(config: AppConfig) -> None:
     """
     Validate configuration and raise errors for missing required settings.
-    
+
     Args:
         config: Application configuration to validate
-        
+
     Raises:
         ValueError: If required configuration is missing
     """
     available_providers = get_available_providers(config)
-    
+
     if not any(available_providers.values()):
         raise ValueError(
             "No AI providers configured. Please set at least one of: "
             "OPENAI_API_KEY, ANTHROPIC_API_KEY, or AZURE_OPENAI_API_KEY"
         )
-    
+
     if config.default_temperature < 0 or config.default_temperature > 2:
         raise ValueError("DEFAULT_TEMPERATURE must be between 0 and 2")
-    
+
     if config.request_timeout <= 0:
         raise ValueError("REQUEST_TIMEOUT must be positive")
-    
+
     if config.max_retries < 0:
-        raise ValueError("MAX_RETRIES must be non-negative") 
\ No newline at end of file
+        raise ValueError("MAX_RETRIES must be non-negative")
+
+    if config.cache_ttl < 0:
+        raise ValueError("CACHE_TTL must be non-negative")
+
+    if config.web_search_concurrency <= 0:
+        raise ValueError("WEB_SEARCH_CONCURRENCY must be positive")
+
+    if config.web_search_rate <= 0:
+        raise ValueError("WEB_SEARCH_RATE must be positive")
+
+    if config.web_workers <= 0:
+        raise ValueError("WEB_WORKERS must be positive")
@@ -5,83 +5,121 @@ This module provides consistent logging setup across the entire application
 with proper formatting, levels, and output handling.
 """
 
+import atexit
+import copy
 import logging
-import sys
-from typing import Optional
+import logging.config
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Base logging configuration; setup_logging fills in levels and handlers
+LOGGING_CONFIG: Dict[str, Any] = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "standard": {"format": "%(asctime)s - %(levelname)s - %(message)s"},
+        "debug": {
+            "format": (
+                "%(asctime)s - %(name)s - %(levelname)s - "
+                "%(filename)s:%(lineno)d - %(message)s"
+            )
+        },
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "stream": "ext://sys.stdout",
+        },
+    },
+    "loggers": {
+        # Reduce noise from external libraries
+        "urllib3": {"level": "WARNING"},
+        "httpx": {"level": "WARNING"},
+        "openai": {"level": "WARNING"},
+        # Our application loggers
+        "coi": {},
+    },
+    "root": {
+        "handlers": ["console"],
+    },
+}
+
+# Background listener writing queued records to the log file
+_listener: Optional[QueueListener] = None
 
 
 def setup_logging(
-    level: str = "INFO",
-    log_file: Optional[str] = None,
-    enable_debug: bool = False
+    level: str = "INFO", log_file: Optional[str] = None, enable_debug: bool = False
 ) -> None:
     """
     Set up application-wide logging configuration.
-    
+
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path to write logs to
         enable_debug: Enable debug mode with more verbose output
     """
+    global _listener
+
     # Convert string level to logging constant
     numeric_level = getattr(logging, level.upper(), logging.INFO)
-    
-    # Create formatter
-    if enable_debug:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-        )
-    else:
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s'
-        )
-    
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(numeric_level)
-    
-    # Remove existing handlers
-    for handler in root_logger.handlers[:]:
-        root_logger.removeHandler(handler)
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(numeric_level)
-    console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
-    # File handler (if specified)
+    formatter = "debug" if enable_debug else "standard"
+
+    config = copy.deepcopy(LOGGING_CONFIG)
+    config["handlers"]["console"].update(level=numeric_level, formatter=formatter)
+    config["loggers"]["coi"]["level"] = numeric_level
+    config["root"]["level"] = numeric_level
+
+    # Flush records queued for the previous log file before replacing it
+    _stop_listener()
+
+    # Replaces any handlers installed by a previous call
+    logging.config.dictConfig(config)
+
+    # File handler (if specified), written from a background thread so
+    # request threads never block on disk I/O
     if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
-        
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(numeric_level)
-        file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
-    
-    # Set specific logger levels
-    # Reduce noise from external libraries
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("openai").setLevel(logging.WARNING)
-    
-    # Our application loggers
-    logging.getLogger("coi").setLevel(numeric_level)
-    
+        file_handler.setFormatter(
+            logging.Formatter(config["formatters"][formatter]["format"])
+        )
+
+        log_queue = queue.SimpleQueue()
+        logging.getLogger().addHandler(QueueHandler(log_queue))
+
+        _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging configured: level={level}, file={log_file}, debug={enable_debug}")
+    logger.info(
+        f"Logging configured: level={level}, file={log_file}, debug={enable_debug}"
+    )
+
+
+def _stop_listener() -> None:
+    """Stop the file listener, writing out any records still queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
 
 
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance with consistent naming.
-    
+
     Args:
         name: Logger name (usually __name__)
-        
+
     Returns:
         Configured logger instance
     """
-    return logging.getLogger(name) 
\ No newline at end of file
+    return logging.getLogger(name)
@@ -0,0 +1,71 @@
+"""
+Rate limiting helpers for the AI experimentation platform.
+
+This module provides an asyncio token bucket for smoothing bursts of
+outbound requests to external services.
+"""
+
+import asyncio
+import time
+from typing import Any, Optional
+
+
+class AsyncRateLimiter:
+    """
+    Token bucket limiting how often an operation may start.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``;
+    each acquire takes one token, waiting for a refill when the bucket is
+    empty. Use as ``async with limiter: ...``.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size (defaults to rate, at least 1)
+
+        Raises:
+            ValueError: If rate is not positive or capacity is below one token
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity is not None and capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.rate = rate
+        # A bucket that cannot hold a whole token would never allow a request
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+        # Created on first use so it binds to the running event loop
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """Take one token, waiting until one is available."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
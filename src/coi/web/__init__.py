@@ -5,6 +5,6 @@ This package provides a Flask-based web interface for interacting with
 AI models and building applications through a chat interface.
 """
 
-from .app import create_app
+from .app import create_app, create_asgi_app
 
-__all__ = ["create_app"]
\ No newline at end of file
+__all__ = ["create_app", "create_asgi_app"]
@@ -6,124 +6,271 @@ chat-based AI app generation platform.
 """
 
 import asyncio
-from flask import Flask, render_template, request, jsonify
-from flask_cors import CORS
+import atexit
+import concurrent.futures
 import logging
+import threading
+from typing import Any, Optional, Union
+
+from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import JSONProvider
+from flask_cors import CORS
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:
+    WsgiToAsgi = None
 
-from ..utils.config import load_config
 from ..providers.factory import ProviderFactory
 from ..tools.web_search import WebSearchTool
+from ..utils.config import AppConfig, load_config
+from ..utils.logging import setup_logging
 
 logger = logging.getLogger(__name__)
 
 
-def create_app():
-    """Create and configure the Flask application."""
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that serializes and parses with orjson."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Send orjson's bytes directly rather than round-tripping through str
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Run an event loop until stopped, then close it."""
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def create_app(config: Optional[AppConfig] = None):
+    """
+    Create and configure the Flask application.
+
+    Args:
+        config: Application configuration (loaded from the environment if omitted)
+    """
     app = Flask(__name__)
-    CORS(app)
-    
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+
     # Load configuration
-    config = load_config()
-    
+    if config is None:
+        config = load_config()
+
+    # Let browsers cache preflight responses for a day
+    CORS(
+        app,
+        resources={
+            r"/api/*": {
+                "origins": config.cors_origins.split(","),
+                "methods": ["GET", "POST"],
+                "allow_headers": ["Content-Type"],
+                "max_age": 86400,
+            }
+        },
+    )
+
+    # Compress JSON and HTML responses, preferring brotli over gzip
+    if Compress is not None:
+        app.config["COMPRESS_MIMETYPES"] = ["application/json", "text/html"]
+        app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+        app.config["COMPRESS_MIN_SIZE"] = 512
+        Compress(app)
+
     # Initialize tools
-    web_search = WebSearchTool()
-    
-    @app.route('/')
+    web_search = WebSearchTool(
+        max_concurrency=config.web_search_concurrency,
+        requests_per_second=config.web_search_rate,
+    )
+
+    # Run coroutines on one long-lived event loop so clients and connection
+    # pools survive between requests
+    loop = asyncio.new_event_loop()
+    loop_thread = threading.Thread(
+        target=_run_loop, args=(loop,), name="coi-event-loop", daemon=True
+    )
+    loop_thread.start()
+    app.extensions["bg_loop"] = loop
+
+    def run_async(coro, timeout=None):
+        """Run a coroutine on the background loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            # Stop the abandoned task instead of leaving it running on the loop
+            future.cancel()
+            raise
+
+    async def close_clients():
+        """Close the HTTP clients owned by this app's tools and providers."""
+        await web_search.aclose()
+
+        providers = app.extensions["providers"]
+        for provider in list(providers.values()):
+            await provider.aclose()
+        providers.clear()
+
+    def shutdown():
+        """Close pooled connections and stop the background loop."""
+        if not loop.is_running():
+            return
+
+        try:
+            run_async(close_clients(), timeout=5)
+        except Exception as e:
+            logger.warning(f"Error closing HTTP clients: {e}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        loop_thread.join(timeout=5)
+
+    app.extensions["bg_shutdown"] = shutdown
+    atexit.register(shutdown)
+
+    # One provider per name for the lifetime of the app, so each keeps its
+    # HTTP connection pool warm across requests. The app owns these
+    # instances and closes them at shutdown, so they are not shared through
+    # the factory cache with other apps in the process.
+    providers = app.extensions["providers"] = {}
+
+    # Availability depends only on the immutable config, so compute and
+    # encode the response body once
+    available = ProviderFactory.get_available_providers(config)
+    app.extensions["providers_available"] = available
+    app.extensions["providers_body"] = app.json.dumps(
+        {"success": True, "providers": available}
+    ).encode()
+    providers_lock = threading.Lock()
+
+    def get_provider(name):
+        """Return the app's provider for name, creating it on first use."""
+        provider = providers.get(name)
+        if provider is None:
+            with providers_lock:
+                provider = providers.get(name)
+                if provider is None:
+                    provider = providers[name] = ProviderFactory.create_provider(
+                        name, config, shared=False
+                    )
+        return provider
+
+    @app.route("/")
     def index():
         """Main application page."""
-        return render_template('index.html')
-    
-    @app.route('/api/providers')
+        return render_template("index.html")
+
+    @app.route("/api/providers")
     def get_providers():
         """Get available AI providers."""
-        try:
-            available = ProviderFactory.get_available_providers(config)
-            return jsonify({
-                'success': True,
-                'providers': available
-            })
-        except Exception as e:
-            logger.error(f"Error getting providers: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
-    
-    @app.route('/api/chat', methods=['POST'])
+        return app.response_class(
+            app.extensions["providers_body"], mimetype="application/json"
+        )
+
+    @app.route("/api/chat", methods=["POST"])
     def chat():
         """Handle chat messages."""
         try:
             data = request.get_json()
-            
-            message = data.get('message', '')
-            provider_name = data.get('provider', 'openai')
-            
+
+            message = data.get("message", "")
+            provider_name = data.get("provider", "openai")
+
             if not message:
-                return jsonify({
-                    'success': False,
-                    'error': 'Message is required'
-                }), 400
-            
-            # Create provider
-            provider = ProviderFactory.create_provider(provider_name, config)
-            
+                return jsonify({"success": False, "error": "Message is required"}), 400
+
+            provider = get_provider(provider_name)
+
             # For now, just echo the message with provider info
             # TODO: Implement actual AI generation with function calling
             response_text = f"Echo from {provider_name}: {message}"
-            
-            return jsonify({
-                'success': True,
-                'response': response_text,
-                'provider': provider_name,
-                'tokens': {
-                    'prompt': 0,
-                    'completion': 0,
-                    'total': 0
-                },
-                'cost': 0.0
-            })
-            
+
+            return jsonify(
+                {
+                    "success": True,
+                    "response": response_text,
+                    "provider": provider_name,
+                    "tokens": {"prompt": 0, "completion": 0, "total": 0},
+                    "cost": 0.0,
+                }
+            )
+
         except Exception as e:
             logger.error(f"Error in chat: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
-    
-    @app.route('/api/search', methods=['POST'])
+            return jsonify({"success": False, "error": str(e)}), 500
+
+    @app.route("/api/search", methods=["POST"])
     def search():
         """Handle web search requests."""
         try:
             data = request.get_json()
-            query = data.get('query', '')
-            
+            query = data.get("query", "")
+
             if not query:
-                return jsonify({
-                    'success': False,
-                    'error': 'Query is required'
-                }), 400
-            
-            # Run async search in sync context
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                result = loop.run_until_complete(web_search.execute(query))
-                
-                return jsonify({
-                    'success': result.success,
-                    'content': result.content,
-                    'error': result.error,
-                    'metadata': result.metadata
-                })
-            finally:
-                loop.close()
-                
+                return jsonify({"success": False, "error": "Query is required"}), 400
+
+            result = run_async(
+                web_search.execute(query), timeout=web_search.timeout + 5
+            )
+
+            return jsonify(
+                {
+                    "success": result.success,
+                    "content": result.content,
+                    "error": result.error,
+                    "metadata": result.metadata,
+                }
+            )
+
         except Exception as e:
             logger.error(f"Error in search: {e}")
-            return jsonify({
-                'success': False,
-                'error': str(e)
-            }), 500
-    
-    return app
\ No newline at end of file
+            return jsonify({"success": False, "error": str(e)}), 500
+
+    return app
+
+
+def create_asgi_app():
+    """
+    Create the Flask application wrapped for an ASGI server such as uvicorn.
+
+    Returns:
+        ASGI application serving the Flask app
+
+    Raises:
+        ImportError: If asgiref is not installed
+    """
+    if WsgiToAsgi is None:
+        raise ImportError(
+            "asgiref package not found. Install with: pip install asgiref"
+        )
+
+    # Runs in each server worker process, which does not inherit the
+    # launcher's logging setup
+    config = load_config()
+    setup_logging(
+        level=config.log_level,
+        log_file=config.log_file,
+        enable_debug=config.enable_debug,
+    )
+
+    return WsgiToAsgi(create_app(config))
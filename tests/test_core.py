@@ -0,0 +1,81 @@
+"""
+Tests for core platform components.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coi.core.ledger import ResponseLedger
+from coi.providers.base import AIResponse
+
+
+class TestResponseLedger:
+    """Test cases for ResponseLedger."""
+
+    def test_ledger_totals_and_numpy_views(self):
+        """Test recorded responses are summarized column-wise."""
+        ledger = ResponseLedger()
+        ledger.extend(
+            [
+                AIResponse("a", 10, 5, 15, "gpt-4o", 0.25, "openai"),
+                AIResponse(
+                    "b",
+                    20,
+                    10,
+                    30,
+                    "claude-3-haiku-20240307",
+                    0.5,
+                    "anthropic",
+                    metadata={"cache_read_input_tokens": 8},
+                ),
+            ]
+        )
+
+        columns = ledger.to_numpy()
+
+        assert len(ledger) == 2
+        assert ledger.total_tokens == 45
+        assert ledger.total_cost == 0.75
+        assert columns["prompt_tokens"].tolist() == [10, 20]
+        assert columns["cache_read_tokens"].tolist() == [0, 8]
+
+    def test_ledger_is_read_only_while_views_exist(self):
+        """Test appending fails while numpy views are alive and works after."""
+        ledger = ResponseLedger()
+        ledger.append(AIResponse("a", 10, 5, 15, "gpt-4o", 0.25, "openai"))
+        response = AIResponse("b", 20, 10, 30, "gpt-4o", 0.5, "openai")
+
+        columns = ledger.to_numpy()
+        with pytest.raises(BufferError):
+            ledger.append(response)
+
+        del columns
+        ledger.append(response)
+
+        assert ledger.models == ["gpt-4o", "gpt-4o"]
+        assert ledger.to_numpy()["costs"].tolist() == [0.25, 0.5]
+
+    def test_failed_append_keeps_columns_aligned(self):
+        """Test a BufferError from a single held view leaves no column grown."""
+        ledger = ResponseLedger()
+        ledger.append(AIResponse("a", 10, 5, 15, "gpt-4o", 0.25, "openai"))
+
+        costs = ledger.to_numpy()["costs"]
+        with pytest.raises(BufferError):
+            ledger.append(AIResponse("b", 20, 10, 30, "gpt-4o", 0.5, "openai"))
+
+        assert len(ledger.prompt_tokens) == len(ledger.costs) == len(ledger.models) == 1
+        assert ledger.total_tokens == 15
+        del costs
+
+    def test_empty_ledger(self):
+        """Test an empty ledger exposes empty columns."""
+        ledger = ResponseLedger()
+
+        assert len(ledger) == 0
+        assert ledger.to_numpy()["costs"].size == 0
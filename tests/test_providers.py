@@ -4,29 +4,60 @@ Tests for AI provider implementations.
 This module demonstrates testing best practices for the AI experimentation platform.
 """
 
-import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import gc
+import json
 import sys
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
 
 # Add src to path for testing
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from coi.providers.base import ProviderConfig, BaseProvider, AIResponse, ProviderError
+from coi.providers.anthropic_provider import AnthropicProvider
+from coi.providers.base import (
+    AIResponse,
+    BaseProvider,
+    GenerateOptions,
+    InvalidConfigError,
+    ProviderConfig,
+    ProviderError,
+)
+from coi.providers.factory import ProviderFactory
 from coi.providers.openai_provider import OpenAIProvider
+from coi.utils.config import AppConfig
+
+
+def make_openai_stream(content, prompt_tokens, completion_tokens):
+    """Build a fake chat completion stream: one content chunk, then usage."""
+
+    async def fake_stream(**kwargs):
+        chunk = MagicMock(id="test-response-id", created=1234567890, usage=None)
+        chunk.choices[0].delta.content = content
+        chunk.choices[0].finish_reason = "stop"
+        yield chunk
+
+        yield MagicMock(
+            id="test-response-id",
+            created=1234567890,
+            choices=[],
+            usage=MagicMock(
+                prompt_tokens=prompt_tokens, completion_tokens=completion_tokens
+            ),
+        )
+
+    return fake_stream
 
 
 class TestProviderConfig:
     """Test cases for ProviderConfig."""
-    
+
     def test_provider_config_creation(self):
         """Test creating a provider configuration."""
-        config = ProviderConfig(
-            api_key="test-key",
-            timeout=30,
-            max_retries=3
-        )
-        
+        config = ProviderConfig(api_key="test-key", timeout=30, max_retries=3)
+
         assert config.api_key == "test-key"
         assert config.timeout == 30
         assert config.max_retries == 3
@@ -36,94 +67,813 @@ class TestProviderConfig:
 
 class TestOpenAIProvider:
     """Test cases for OpenAI provider."""
-    
+
     def test_provider_initialization(self):
         """Test OpenAI provider initialization."""
         config = ProviderConfig(api_key="sk-test-key")
-        
-        with patch('coi.providers.openai_provider.AsyncOpenAI'):
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
             provider = OpenAIProvider(config)
             assert provider.config.api_key == "sk-test-key"
-    
+
     def test_invalid_api_key(self):
         """Test validation of invalid API key."""
         config = ProviderConfig(api_key="invalid-key")
-        
+
         with pytest.raises(Exception):  # Should raise InvalidConfigError
-            with patch('coi.providers.openai_provider.AsyncOpenAI'):
+            with patch("coi.providers.openai_provider.AsyncOpenAI"):
                 OpenAIProvider(config)
-    
+
+    def test_api_key_formats(self):
+        """Test project keys are accepted and malformed keys rejected."""
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
+            OpenAIProvider(ProviderConfig(api_key="sk-proj-abc_DEF-123"))
+
+            for key in ("sk-test key", "sk-test-key\n", "pk-test-key"):
+                with pytest.raises(InvalidConfigError):
+                    OpenAIProvider(ProviderConfig(api_key=key))
+
     def test_get_available_models(self):
         """Test getting available models."""
         config = ProviderConfig(api_key="sk-test-key")
-        
-        with patch('coi.providers.openai_provider.AsyncOpenAI'):
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
             provider = OpenAIProvider(config)
             models = provider.get_available_models()
-            
+
             assert isinstance(models, list)
             assert len(models) > 0
-            assert 'gpt-3.5-turbo' in models
-    
+            assert "gpt-3.5-turbo" in models
+
     def test_cost_calculation(self):
         """Test cost calculation for different models."""
         config = ProviderConfig(api_key="sk-test-key")
-        
-        with patch('coi.providers.openai_provider.AsyncOpenAI'):
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
             provider = OpenAIProvider(config)
-            
+
             # Test known model
-            cost = provider._calculate_cost('gpt-3.5-turbo', 100, 50)
-            expected = (100/1000 * 0.0015) + (50/1000 * 0.002)
+            cost = provider._calculate_cost("gpt-3.5-turbo", 100, 50)
+            expected = (100 / 1000 * 0.0015) + (50 / 1000 * 0.002)
             assert abs(cost - expected) < 0.000001
-    
+
     def test_estimate_cost(self):
         """Test cost estimation."""
         config = ProviderConfig(api_key="sk-test-key")
-        
-        with patch('coi.providers.openai_provider.AsyncOpenAI'):
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
             provider = OpenAIProvider(config)
-            
+
             cost = provider.estimate_cost("Test prompt", "gpt-3.5-turbo", 100)
             assert cost > 0
             assert isinstance(cost, float)
-    
+
+    def test_count_tokens_uses_tokenizer(self):
+        """Test token counting prefers the model tokenizer over length."""
+        config = ProviderConfig(api_key="sk-test-key")
+        encoding = MagicMock()
+        encoding.encode.return_value = [1, 2, 3]
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
+            provider = OpenAIProvider(config)
+
+        with patch(
+            "coi.providers.openai_provider._get_encoding", return_value=encoding
+        ):
+            assert provider.count_tokens("some longer test prompt", "gpt-4o") == 3
+
+        with patch("coi.providers.openai_provider._get_encoding", return_value=None):
+            assert provider.count_tokens("some longer test prompt", "gpt-4o") == 5
+
     @pytest.mark.asyncio
     async def test_generate_success(self):
         """Test successful generation."""
         config = ProviderConfig(api_key="sk-test-key")
-        
-        # Mock OpenAI response
-        mock_response = MagicMock()
-        mock_response.choices = [MagicMock()]
-        mock_response.choices[0].message.content = "Test response"
-        mock_response.choices[0].finish_reason = "stop"
-        mock_response.usage.prompt_tokens = 10
-        mock_response.usage.completion_tokens = 20
-        mock_response.usage.total_tokens = 30
-        mock_response.id = "test-response-id"
-        mock_response.created = 1234567890
-        
-        with patch('coi.providers.openai_provider.AsyncOpenAI') as mock_client_class:
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
             mock_client = AsyncMock()
-            mock_client.chat.completions.create.return_value = mock_response
+            mock_client.chat.completions.create.side_effect = make_openai_stream(
+                "Test response", 10, 20
+            )
             mock_client_class.return_value = mock_client
-            
+
             provider = OpenAIProvider(config)
-            
+
             response = await provider.generate("Test prompt", "gpt-3.5-turbo")
-            
+
             assert isinstance(response, AIResponse)
             assert response.content == "Test response"
             assert response.provider == "openai"
             assert response.model == "gpt-3.5-turbo"
             assert response.total_tokens == 30
             assert response.cost_usd > 0
+            assert response.metadata["finish_reason"] == "stop"
+
+    @pytest.mark.asyncio
+    async def test_deterministic_generate_uses_cache(self):
+        """Test identical temperature=0 calls are served from the cache."""
+        config = ProviderConfig(api_key="sk-test-key")
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create.side_effect = make_openai_stream(
+                "Cached response", 10, 20
+            )
+            mock_client_class.return_value = mock_client
+
+            provider = OpenAIProvider(config)
+
+            first = await provider.generate(
+                "Test prompt", "gpt-3.5-turbo", temperature=0
+            )
+            second = await provider.generate(
+                "Test prompt", "gpt-3.5-turbo", temperature=0
+            )
+
+            assert mock_client.chat.completions.create.await_count == 1
+            assert second.content == first.content
+            assert second.metadata["cache_hit"] is True
+            assert second.cost_usd == 0.0
+            assert second.metadata["original_cost_usd"] == first.cost_usd > 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        """Test identical in-flight temperature=0 calls are coalesced."""
+        config = ProviderConfig(api_key="sk-test-key", cache_backend="none")
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create.side_effect = make_openai_stream(
+                "Shared", 10, 20
+            )
+            mock_client_class.return_value = mock_client
+
+            provider = OpenAIProvider(config)
+
+            first, second = await asyncio.gather(
+                provider.generate("Test prompt", temperature=0),
+                provider.generate("Test prompt", temperature=0),
+            )
+
+            assert mock_client.chat.completions.create.await_count == 1
+            assert first.content == second.content == "Shared"
+            assert provider._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_request_with_no_waiters_is_retrieved(self):
+        """Test a failure after every caller cancelled is not logged as unretrieved."""
+        config = ProviderConfig(
+            api_key="sk-test-key", max_retries=0, cache_backend="none"
+        )
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+
+        async def fail(**kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create.side_effect = fail
+            mock_client_class.return_value = mock_client
+
+            provider = OpenAIProvider(config)
+            caller = asyncio.ensure_future(
+                provider.generate("Test prompt", temperature=0)
+            )
+            await asyncio.sleep(0)
+            caller.cancel()
+
+            while provider._inflight:
+                await asyncio.sleep(0.01)
+            gc.collect()
+
+            assert errors == []
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_content_chunks(self):
+        """Test streaming yields each non-empty content delta."""
+        config = ProviderConfig(api_key="sk-test-key")
+
+        async def fake_stream():
+            for text in ["Hel", None, "lo"]:
+                chunk = MagicMock()
+                chunk.choices[0].delta.content = text
+                yield chunk
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create.return_value = fake_stream()
+            mock_client_class.return_value = mock_client
+
+            provider = OpenAIProvider(config)
+
+            chunks = [chunk async for chunk in provider.stream("Test prompt")]
+
+            assert chunks == ["Hel", "lo"]
+            assert (
+                mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+            )
+
+    @pytest.mark.asyncio
+    async def test_retry_honours_retry_after_header(self):
+        """Test rate-limited calls wait at least the server's Retry-After."""
+        config = ProviderConfig(api_key="sk-test-key", max_retries=1)
+
+        class FakeRateLimit(Exception):
+            response = MagicMock(headers={"retry-after": "7"})
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
+            provider = OpenAIProvider(config)
+
+        create = AsyncMock(side_effect=[FakeRateLimit(), "ok"])
+
+        with patch(
+            "coi.providers.base.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            result = await provider._call_with_retry(create, {}, FakeRateLimit)
+
+        assert result == "ok"
+        assert mock_sleep.await_args.args[0] >= 7
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """Test bad requests fail fast and SDK-level retries are disabled."""
+        config = ProviderConfig(api_key="sk-test-key", max_retries=3)
+
+        class FakeBadRequest(Exception):
+            status_code = 400
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            provider = OpenAIProvider(config)
+
+        create = AsyncMock(side_effect=FakeBadRequest())
+
+        with pytest.raises(FakeBadRequest):
+            await provider._call_with_retry(create, {}, TimeoutError)
+
+        assert create.await_count == 1
+        assert mock_client_class.call_args.kwargs["max_retries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_generate_many_preserves_order(self):
+        """Test concurrent generation returns responses in prompt order."""
+        config = ProviderConfig(api_key="sk-test-key")
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
+            provider = OpenAIProvider(config)
+
+        async def fake_generate(prompt, model, **kwargs):
+            return AIResponse(
+                content=prompt.upper(),
+                prompt_tokens=1,
+                completion_tokens=1,
+                total_tokens=2,
+                model=model,
+                cost_usd=0.0,
+                provider="openai",
+            )
+
+        with patch.object(provider, "generate", side_effect=fake_generate):
+            responses = await provider.generate_many(
+                ["a", "b", "c"], "gpt-3.5-turbo", max_concurrency=2
+            )
+
+        assert [r.content for r in responses] == ["A", "B", "C"]
+
+    @pytest.mark.asyncio
+    async def test_generate_many_batches_completion_models(self):
+        """Test completion models send every prompt in one request."""
+        config = ProviderConfig(api_key="sk-test-key")
+
+        mock_response = MagicMock()
+        mock_response.choices = [
+            MagicMock(index=1, text="second", finish_reason="stop"),
+            MagicMock(index=0, text="first", finish_reason="stop"),
+        ]
+        mock_response.usage.prompt_tokens = 10
+        mock_response.usage.completion_tokens = 11
+        mock_response.usage.total_tokens = 21
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.completions.create.return_value = mock_response
+            mock_client_class.return_value = mock_client
+
+            provider = OpenAIProvider(config)
+
+            assert await provider.generate_many([], "gpt-3.5-turbo-instruct") == []
+            responses = await provider.generate_many(
+                ["p1", "p2"], "gpt-3.5-turbo-instruct"
+            )
+
+            assert mock_client.completions.create.await_count == 1
+            assert mock_client.completions.create.call_args.kwargs["prompt"] == [
+                "p1",
+                "p2",
+            ]
+            assert [r.content for r in responses] == ["first", "second"]
+            assert sum(r.prompt_tokens for r in responses) == 10
+            assert sum(r.completion_tokens for r in responses) == 11
+            assert responses[0].provider == provider.get_provider_name()
+
+    @pytest.mark.asyncio
+    async def test_generate_many_completion_applies_options(self):
+        """Test typed options reach the completions request without chat-only fields."""
+        config = ProviderConfig(api_key="sk-test-key")
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock(index=0, text="done", finish_reason="stop")]
+        mock_response.usage.prompt_tokens = 5
+        mock_response.usage.completion_tokens = 1
+        mock_response.usage.total_tokens = 6
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.completions.create.return_value = mock_response
+            mock_client_class.return_value = mock_client
+
+            provider = OpenAIProvider(config)
+
+            await provider.generate_many(
+                ["p1"],
+                "gpt-3.5-turbo-instruct",
+                options=GenerateOptions(
+                    temperature=0, max_tokens=5, stop=["END"], system="Be brief"
+                ),
+            )
+
+            params = mock_client.completions.create.call_args.kwargs
+            assert (params["temperature"], params["max_tokens"], params["stop"]) == (
+                0,
+                5,
+                ["END"],
+            )
+            assert "options" not in params
+            assert "system" not in params
+
+
+class TestAnthropicProvider:
+    """Test cases for Anthropic provider."""
+
+    @pytest.mark.asyncio
+    async def test_generate_marks_stable_prefix_for_caching(self):
+        """Test system prompt and history are sent with cache_control."""
+        config = ProviderConfig(api_key="sk-ant-test-key")
+
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(text="Test response")]
+        mock_response.usage.input_tokens = 10
+        mock_response.usage.output_tokens = 20
+        mock_response.usage.cache_read_input_tokens = 0
+        mock_response.usage.cache_creation_input_tokens = 0
+        mock_response.stop_reason = "end_turn"
+
+        async def text_stream():
+            yield "Test response"
+
+        mock_stream = MagicMock(text_stream=text_stream())
+        mock_stream.get_final_message = AsyncMock(return_value=mock_response)
+
+        with patch(
+            "coi.providers.anthropic_provider.AsyncAnthropic"
+        ) as mock_client_class:
+            mock_client = MagicMock()
+            mock_client.messages.stream.return_value.__aenter__.return_value = (
+                mock_stream
+            )
+            mock_client_class.return_value = mock_client
+
+            provider = AnthropicProvider(config)
+
+            await provider.generate(
+                "Next question",
+                system="You are a helpful assistant.",
+                history=[
+                    {"role": "user", "content": "First question"},
+                    {"role": "assistant", "content": "First answer"},
+                ],
+            )
+
+            params = mock_client.messages.stream.call_args.kwargs
+            assert params["system"][0]["cache_control"] == {"type": "ephemeral"}
+            assert params["messages"][0]["content"] == "First question"
+            assert params["messages"][1]["content"][0]["cache_control"] == {
+                "type": "ephemeral"
+            }
+            assert params["messages"][2] == {"role": "user", "content": "Next question"}
+
+    @pytest.mark.asyncio
+    async def test_generate_batch_applies_discount_and_keeps_order(self):
+        """Test batch results map back to prompts and bill at half price."""
+        config = ProviderConfig(api_key="sk-ant-test-key")
+
+        def make_entry(custom_id, text):
+            message = MagicMock(content=[MagicMock(text=text)], stop_reason="end_turn")
+            message.usage.input_tokens = 100
+            message.usage.output_tokens = 10
+            message.usage.cache_read_input_tokens = 0
+            message.usage.cache_creation_input_tokens = 0
+            return MagicMock(
+                custom_id=custom_id, result=MagicMock(type="succeeded", message=message)
+            )
+
+        async def results():
+            yield make_entry("1", "second")
+            yield MagicMock(custom_id="2", result=MagicMock(type="expired", error=None))
+            yield make_entry("0", "first")
+
+        with patch(
+            "coi.providers.anthropic_provider.AsyncAnthropic"
+        ) as mock_client_class:
+            mock_client = MagicMock()
+            batches = mock_client.messages.batches
+            batches.create = AsyncMock(return_value=MagicMock(id="batch-1"))
+            batches.retrieve = AsyncMock(
+                side_effect=[
+                    MagicMock(processing_status="in_progress"),
+                    MagicMock(processing_status="ended"),
+                ]
+            )
+            batches.results = AsyncMock(return_value=results())
+            mock_client_class.return_value = mock_client
+
+            provider = AnthropicProvider(config)
+
+            with patch("coi.providers.base.asyncio.sleep", new_callable=AsyncMock):
+                responses = await provider.generate_batch(
+                    ["p1", "p2", "p3"],
+                    "claude-3-haiku-20240307",
+                    options=GenerateOptions(max_tokens=50, stop=["END"]),
+                )
+
+        requests = batches.create.call_args.kwargs["requests"]
+        assert [r["custom_id"] for r in requests] == ["0", "1", "2"]
+        assert requests[0]["params"]["max_tokens"] == 50
+        assert requests[0]["params"]["stop_sequences"] == ["END"]
+        assert "options" not in requests[0]["params"]
+        assert [r.content for r in responses] == ["first", "second", ""]
+        assert responses[2].metadata["error"] == "expired"
+        assert responses[0].cost_usd == pytest.approx(
+            0.5 * provider._calculate_cost("claude-3-haiku-20240307", 100, 10)
+        )
+
+    def test_generate_options_map_to_vendor_fields(self):
+        """Test typed options translate to Anthropic's request field names."""
+        options = GenerateOptions(
+            temperature=0.2, top_p=0.9, stop=["END"], system="Be brief."
+        )
+
+        with patch("coi.providers.anthropic_provider.AsyncAnthropic"):
+            provider = AnthropicProvider(ProviderConfig(api_key="sk-ant-test-key"))
+
+        temperature, max_tokens, kwargs = provider._apply_options(
+            options, 0.7, None, {}
+        )
+        params = provider._build_request(
+            "Hi", provider.DEFAULT_MODEL, temperature, max_tokens, **kwargs
+        )
+
+        assert params["stop_sequences"] == ["END"]
+        assert "stop" not in params
+        assert "temperature" not in params and "top_p" not in params
+        assert params["system"][0]["text"] == "Be brief."
+
+    def test_cost_calculation_with_prompt_cache(self):
+        """Test cache reads and writes are billed at their own rates."""
+        config = ProviderConfig(api_key="sk-ant-test-key")
+
+        with patch("coi.providers.anthropic_provider.AsyncAnthropic"):
+            provider = AnthropicProvider(config)
+
+            cost = provider._calculate_cost(
+                "claude-3-5-sonnet-20241022",
+                100,
+                50,
+                cache_read_tokens=1000,
+                cache_write_tokens=2000,
+            )
+            expected = (
+                (100 / 1000 * 0.003)
+                + (50 / 1000 * 0.015)
+                + (1000 / 1000 * 0.0003)
+                + (2000 / 1000 * 0.00375)
+            )
+            assert abs(cost - expected) < 0.000001
+
+    def test_bulk_costs_match_per_call_costs(self):
+        """Test vectorized cost accounting agrees with _calculate_cost."""
+        config = ProviderConfig(api_key="sk-ant-test-key")
+
+        with patch("coi.providers.anthropic_provider.AsyncAnthropic"):
+            provider = AnthropicProvider(config)
+
+        models = ["claude-3-opus-20240229", "claude-3-haiku-20240307", "unknown-model"]
+        costs = AnthropicProvider.calculate_costs_bulk(
+            models,
+            [100, 200, 300],
+            [10, 20, 30],
+            cache_read_tokens=[0, 1000, 0],
+            cache_write_tokens=[500, 0, 0],
+        )
+
+        expected = [
+            provider._calculate_cost(models[0], 100, 10, cache_write_tokens=500),
+            provider._calculate_cost(models[1], 200, 20, cache_read_tokens=1000),
+            provider._calculate_cost(models[2], 300, 30),
+        ]
+        assert costs == pytest.approx(expected)
+
+
+class TestSDKClients:
+    """Test cases that build the real vendor SDK clients."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "provider_class, api_key",
+        [
+            (OpenAIProvider, "sk-test-key"),
+            (AnthropicProvider, "sk-ant-test-key"),
+        ],
+    )
+    async def test_sdk_accepts_pooled_http_client(self, provider_class, api_key):
+        """Test each SDK client is built with its own pooled HTTP client."""
+        provider = provider_class(ProviderConfig(api_key=api_key))
+
+        try:
+            assert isinstance(
+                provider.client._client, provider._sdk.DefaultAsyncHttpxClient
+            )
+        finally:
+            await provider.aclose()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "provider_class, api_key, events",
+        [
+            (
+                OpenAIProvider,
+                "sk-test-key",
+                [
+                    {
+                        "id": "c1",
+                        "object": "chat.completion.chunk",
+                        "created": 1,
+                        "model": "gpt-4o",
+                        "choices": [
+                            {
+                                "index": 0,
+                                "delta": {"content": "Hello"},
+                                "finish_reason": "stop",
+                            }
+                        ],
+                    },
+                    {
+                        "id": "c1",
+                        "object": "chat.completion.chunk",
+                        "created": 1,
+                        "model": "gpt-4o",
+                        "choices": [],
+                        "usage": {
+                            "prompt_tokens": 12,
+                            "completion_tokens": 5,
+                            "total_tokens": 17,
+                        },
+                    },
+                ],
+            ),
+            (
+                AnthropicProvider,
+                "sk-ant-test-key",
+                [
+                    {
+                        "type": "message_start",
+                        "message": {
+                            "id": "msg_1",
+                            "type": "message",
+                            "role": "assistant",
+                            "model": "claude-3-haiku-20240307",
+                            "content": [],
+                            "stop_reason": None,
+                            "stop_sequence": None,
+                            "usage": {"input_tokens": 12, "output_tokens": 1},
+                        },
+                    },
+                    {
+                        "type": "content_block_start",
+                        "index": 0,
+                        "content_block": {"type": "text", "text": ""},
+                    },
+                    {
+                        "type": "content_block_delta",
+                        "index": 0,
+                        "delta": {"type": "text_delta", "text": "Hello"},
+                    },
+                    {"type": "content_block_stop", "index": 0},
+                    {
+                        "type": "message_delta",
+                        "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                        "usage": {"output_tokens": 5},
+                    },
+                    {"type": "message_stop"},
+                ],
+            ),
+        ],
+    )
+    async def test_generate_over_sdk_transport(self, provider_class, api_key, events):
+        """Test generate() sends a payload the real SDK accepts and parses it."""
+        httpx2 = pytest.importorskip("httpx2")
+        requests = []
+
+        def handler(request):
+            requests.append(json.loads(request.content))
+            body = "".join(
+                f"event: {e.get('type', 'chunk')}\ndata: {json.dumps(e)}\n\n"
+                for e in events
+            )
+            if provider_class is OpenAIProvider:
+                body += "data: [DONE]\n\n"
+            return httpx2.Response(
+                200,
+                headers={"content-type": "text/event-stream"},
+                content=body.encode(),
+            )
+
+        provider = provider_class(ProviderConfig(api_key=api_key, cache_backend="none"))
+        await provider.aclose()
+        provider.client = provider.client.with_options(
+            http_client=httpx2.AsyncClient(transport=httpx2.MockTransport(handler))
+        )
+
+        try:
+            response = await provider.generate(
+                "Hi", max_tokens=20, options=GenerateOptions(stop=["END"])
+            )
+        finally:
+            await provider.aclose()
+
+        assert response.content == "Hello"
+        assert (response.prompt_tokens, response.completion_tokens) == (12, 5)
+        assert requests[0]["stream"] is True
+        if provider_class is AnthropicProvider:
+            assert requests[0]["stop_sequences"] == ["END"]
+            assert "temperature" not in requests[0]
+        else:
+            assert requests[0]["stream_options"] == {"include_usage": True}
+
+
+class TestSemanticCache:
+    """Test cases for SemanticCache."""
+
+    @pytest.mark.asyncio
+    async def test_similar_prompt_hits_same_model_only(self):
+        """Test a near-duplicate prompt returns the cached response."""
+        from coi.providers.semantic_cache import SemanticCache
+
+        vectors = {
+            "What is Python?": [1.0, 0.0],
+            "what is python": [0.99, 0.05],
+            "Bake a cake": [0.0, 1.0],
+        }
+
+        async def fake_embed(text):
+            return vectors[text]
+
+        cache = SemanticCache(embed=fake_embed, threshold=0.92)
+        await cache.set("What is Python?", "gpt-4o", "A programming language")
+
+        assert await cache.get("what is python", "gpt-4o") == "A programming language"
+        assert await cache.get("what is python", "gpt-4") is None
+        assert await cache.get("Bake a cake", "gpt-4o") is None
+
+    @pytest.mark.asyncio
+    async def test_oldest_entry_is_evicted_when_full(self):
+        """Test inserts beyond max_entries overwrite the oldest response."""
+        from coi.providers.semantic_cache import SemanticCache
+
+        vectors = {"a": [1.0, 0.0, 0.0], "b": [0.0, 1.0, 0.0], "c": [0.0, 0.0, 1.0]}
+
+        async def fake_embed(text):
+            return vectors[text]
+
+        cache = SemanticCache(embed=fake_embed, max_entries=2)
+        for text in ("a", "b", "c"):
+            await cache.set(text, "gpt-4o", text.upper())
+
+        assert len(cache) == 2
+        assert await cache.get("a", "gpt-4o") is None
+        assert await cache.get("b", "gpt-4o") == "B"
+        assert await cache.get("c", "gpt-4o") == "C"
+
+    @pytest.mark.asyncio
+    async def test_provider_partitions_by_request_settings(self):
+        """Test a different system prompt misses and each miss embeds once."""
+        from coi.providers.semantic_cache import SemanticCache
+
+        config = ProviderConfig(api_key="sk-test-key", cache_backend="none")
+        embed = AsyncMock(return_value=[1.0, 0.0])
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI") as mock_client_class:
+            mock_client = AsyncMock()
+            mock_client.chat.completions.create.side_effect = [
+                make_openai_stream("Arr", 10, 20)(),
+                make_openai_stream("Objection", 10, 20)(),
+            ]
+            mock_client_class.return_value = mock_client
+
+            provider = OpenAIProvider(config)
+            provider.semantic_cache = SemanticCache(embed=embed)
+
+            pirate = await provider.generate(
+                "hi", temperature=0, system="You are a pirate"
+            )
+            lawyer = await provider.generate(
+                "hi", temperature=0, system="You are a lawyer"
+            )
+            again = await provider.generate(
+                "hi", temperature=0, system="You are a pirate"
+            )
+
+            assert (pirate.content, lawyer.content, again.content) == (
+                "Arr",
+                "Objection",
+                "Arr",
+            )
+            assert again.metadata["cache_hit"] is True
+            assert again.cost_usd == 0.0
+            assert mock_client.chat.completions.create.await_count == 2
+            assert embed.await_count == 3
+
+
+class TestResponseCache:
+    """Test cases for response cache backends."""
+
+    def test_cache_key_accepts_non_string_dict_keys(self):
+        """Test options such as logit_bias with integer keys can be keyed."""
+        from coi.providers.cache import make_cache_key
+
+        key = make_cache_key(model="gpt-4o", options={"logit_bias": {50256: -100}})
+
+        assert key == make_cache_key(
+            model="gpt-4o", options={"logit_bias": {50256: -100}}
+        )
+        assert key != make_cache_key(
+            model="gpt-4o", options={"logit_bias": {50256: 100}}
+        )
+
+    def test_disk_cache_is_shared_between_instances(self, tmp_path):
+        """Test entries written by one disk cache are visible to another."""
+        pytest.importorskip("diskcache")
+        from coi.providers.cache import create_cache
+
+        writer = create_cache("disk", directory=str(tmp_path))
+        reader = create_cache("disk", directory=str(tmp_path))
+        writer.set("key", {"content": "cached"})
+
+        assert reader.get("key") == {"content": "cached"}
+        assert reader.get("missing") is None
+        assert reader.hit_rate == 0.5
+
+
+class TestProviderFactory:
+    """Test cases for ProviderFactory."""
+
+    def test_create_provider_reuses_instance(self):
+        """Test identical configuration returns the cached provider."""
+        config = AppConfig(openai_api_key="sk-test-key")
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
+            try:
+                first = ProviderFactory.create_provider("openai", config)
+                second = ProviderFactory.create_provider("openai", config)
+
+                assert first is second
+            finally:
+                ProviderFactory._instances.clear()
+
+    def test_shared_instances_are_per_event_loop(self):
+        """Test separate asyncio.run() calls never share a provider."""
+        config = AppConfig(openai_api_key="sk-test-key")
+
+        async def create():
+            return ProviderFactory.create_provider("openai", config)
+
+        with patch("coi.providers.openai_provider.AsyncOpenAI"):
+            try:
+                first = asyncio.run(create())
+                second = asyncio.run(create())
+
+                assert first is not second
+                assert list(ProviderFactory._instances.values()) == [second]
+            finally:
+                ProviderFactory._instances.clear()
 
 
 class TestAIResponse:
     """Test cases for AIResponse."""
-    
+
     def test_ai_response_creation(self):
         """Test creating an AI response."""
         response = AIResponse(
@@ -133,10 +883,10 @@ class TestAIResponse:
             total_tokens=30,
             model="gpt-3.5-turbo",
             cost_usd=0.001,
-            provider="openai"
+            provider="openai",
         )
-        
+
         assert response.content == "Test response"
         assert response.total_tokens == 30
         assert response.provider == "openai"
-        assert response.metadata is None 
\ No newline at end of file
+        assert response.metadata is None
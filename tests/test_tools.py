@@ -0,0 +1,123 @@
+"""
+Tests for AI tool implementations.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coi.tools.web_search import WebSearchTool
+from coi.utils.rate_limit import AsyncRateLimiter
+
+
+class TestWebSearchTool:
+    """Test cases for WebSearchTool."""
+
+    @pytest.mark.asyncio
+    async def test_execute_formats_answer(self):
+        """Test a search response is turned into readable content."""
+
+        def handler(request):
+            assert request.url.params["q"] == "python"
+            return httpx.Response(
+                200,
+                json={
+                    "Abstract": "A programming language.",
+                    "AbstractURL": "https://python.org",
+                    "RelatedTopics": [{"Text": "CPython"}],
+                },
+            )
+
+        tool = WebSearchTool()
+        tool._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        result = await tool.execute("python")
+        await tool.aclose()
+
+        assert result.success
+        assert "Answer: A programming language." in result.content
+        assert result.metadata["related_topics_count"] == 1
+        assert tool._client is None
+
+    @pytest.mark.asyncio
+    async def test_execute_reports_http_errors(self):
+        """Test HTTP failures are returned as an unsuccessful result."""
+        tool = WebSearchTool(max_retries=0)
+        tool._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+
+        result = await tool.execute("python")
+
+        assert not result.success
+        assert result.error.startswith("Network error")
+
+    @pytest.mark.asyncio
+    async def test_execute_retries_rate_limited_search(self):
+        """Test a 429 response is retried before succeeding."""
+        responses = iter(
+            [httpx.Response(429), httpx.Response(200, json={"Definition": "Retried"})]
+        )
+
+        tool = WebSearchTool()
+        tool._client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: next(responses))
+        )
+
+        with patch(
+            "coi.tools.web_search.asyncio.sleep", new_callable=AsyncMock
+        ) as mock_sleep:
+            result = await tool.execute("python")
+
+        assert result.success
+        assert "Definition: Retried" in result.content
+        assert mock_sleep.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_served_from_cache(self):
+        """Test a repeated query skips the HTTP round-trip."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200, json={"Abstract": "A programming language."})
+
+        tool = WebSearchTool()
+        tool._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+        first = await tool.execute("Python")
+        second = await tool.execute("  python ")
+
+        assert second is not first
+        assert second.content == first.content
+        assert (first.metadata["query"], second.metadata["query"]) == (
+            "Python",
+            "  python ",
+        )
+        assert second.metadata is not first.metadata
+        assert len(calls) == 1
+
+
+class TestAsyncRateLimiter:
+    """Test cases for AsyncRateLimiter."""
+
+    @pytest.mark.asyncio
+    async def test_sub_one_rate_still_grants_a_token(self):
+        """Test a rate below one per second can still acquire."""
+        limiter = AsyncRateLimiter(0.5)
+
+        await asyncio.wait_for(limiter.acquire(), timeout=1)
+
+        assert limiter.capacity == 1.0
+
+    def test_capacity_below_one_token_rejected(self):
+        """Test a bucket that could never fill is refused."""
+        with pytest.raises(ValueError):
+            AsyncRateLimiter(5.0, capacity=0.5)
@@ -0,0 +1,102 @@
+"""
+Tests for the Flask web application.
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path for testing
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from coi.providers.factory import ProviderFactory
+from coi.utils.config import AppConfig
+from coi.web import create_app
+
+
+class TestWebApp:
+    """Test cases for the web application."""
+
+    def test_search_requires_query(self):
+        """Test an empty search query is rejected."""
+        app = create_app()
+
+        response = app.test_client().post("/api/search", json={})
+        app.extensions["bg_shutdown"]()
+
+        assert response.status_code == 400
+        assert response.get_json() == {"success": False, "error": "Query is required"}
+
+    def test_shutdown_stops_background_loop(self):
+        """Test shutdown closes clients and stops the background loop."""
+        app = create_app()
+        loop = app.extensions["bg_loop"]
+
+        app.extensions["bg_shutdown"]()
+
+        assert not loop.is_running()
+        assert loop.is_closed()
+
+    def test_chat_reuses_provider(self):
+        """Test chat requests share one provider instance per name."""
+        app = create_app(AppConfig(openai_api_key="sk-test", cache_backend="none"))
+        client = app.test_client()
+
+        with patch.object(
+            ProviderFactory, "create_provider", wraps=ProviderFactory.create_provider
+        ) as create:
+            for _ in range(2):
+                response = client.post(
+                    "/api/chat", json={"message": "hi", "provider": "openai"}
+                )
+                assert response.status_code == 200
+        names = list(app.extensions["providers"])
+        app.extensions["bg_shutdown"]()
+
+        assert create.call_count == 1
+        assert names == ["openai"]
+
+    def test_preflight_is_cacheable(self):
+        """Test CORS preflight responses carry a max age."""
+        app = create_app(AppConfig(cors_origins="https://example.com"))
+
+        response = app.test_client().options(
+            "/api/search",
+            headers={
+                "Origin": "https://example.com",
+                "Access-Control-Request-Method": "POST",
+            },
+        )
+        app.extensions["bg_shutdown"]()
+
+        assert response.headers["Access-Control-Allow-Origin"] == "https://example.com"
+        assert response.headers["Access-Control-Max-Age"] == "86400"
+
+    def test_providers_reports_availability(self):
+        """Test the providers endpoint reflects configured API keys."""
+        app = create_app(AppConfig(anthropic_api_key="sk-ant-test"))
+
+        response = app.test_client().get("/api/providers")
+        app.extensions["bg_shutdown"]()
+
+        assert response.get_json() == {
+            "success": True,
+            "providers": {"openai": False, "anthropic": True},
+        }
+
+    def test_shutdown_closes_only_own_providers(self):
+        """Test shutting one app down leaves another app's providers open."""
+        config = AppConfig(openai_api_key="sk-test", cache_backend="none")
+        first, second = create_app(config), create_app(config)
+
+        for app in (first, second):
+            response = app.test_client().post("/api/chat", json={"message": "hi"})
+            assert response.status_code == 200
+        surviving = second.extensions["providers"]["openai"]
+
+        first.extensions["bg_shutdown"]()
+
+        assert first.extensions["providers"] == {}
+        assert surviving not in ProviderFactory._instances.values()
+        assert not surviving.client.is_closed()
+        second.extensions["bg_shutdown"]()
@@ -9,6 +9,11 @@ import sys
 import os
 from pathlib import Path
 
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
@@ -36,15 +41,25 @@ def main():
         print("Please check your .env file or environment variables.")
         sys.exit(1)
     
-    # Create and run the Flask app
-    app = create_app()
-    
     print("Starting AI App Builder...")
     print("Open your browser and go to: http://localhost:5001")
     print("Press Ctrl+C to stop the server")
     
     try:
-        app.run(debug=True, host='0.0.0.0', port=5001)
+        if config.environment != "development" and uvicorn is not None:
+            # Each worker process builds its own app through the factory
+            uvicorn.run(
+                "coi.web:create_asgi_app",
+                factory=True,
+                app_dir=str(Path(__file__).parent / "src"),
+                host='0.0.0.0',
+                port=5001,
+                workers=config.web_workers
+            )
+        else:
+            # Flask's development server, with the debugger and reloader in development
+            app = create_app(config)
+            app.run(debug=config.environment == "development", host='0.0.0.0', port=5001)
     except KeyboardInterrupt:
         print("\nShutting down server...")
         sys.exit(0)